@@ -7,6 +7,9 @@ from collections import deque
 import uuid
 import base64
 import getpass
+import struct
+import ctypes
+import ctypes.util
 
 # ================== CONFIG ==================
 
@@ -191,34 +194,24 @@ KO_MESSAGES = [
 # ============== END CONFIG ==================
 
 PIECE_NAMES = ["I", "O", "T", "S", "Z", "J", "L"]
+STATE_BITS = HEIGHT * WIDTH * 4 + 15  # 4 bits per cell, then piece 3, rotation 2, x 5, y 5
+STATE_BYTES = (STATE_BITS + 7) // 8
+BOARD_BYTES = HEIGHT * WIDTH // 2  # Two cells per byte
+HEX_DIGIT_VALUES = bytes.maketrans(b"0123456789abcdef", bytes(range(16)))  # Hex digit -> its value
 
 def encode_game_state(board, piece_name, rotation, piece_x, piece_y):
-    bits = []
-    for row in board:
-        for cell in row:
-            cell_val = min(15, max(0, cell))
-            for i in range(3, -1, -1):
-                bits.append((cell_val >> i) & 1)
+    cells = bytes(min(15, max(0, cell)) for row in board for cell in row)
+    # Two cells per byte: each cell is a single hex digit of cells.hex()
+    # ("0" then the value), and the odd digits paired up are the packed board
+    packed_board = bytes.fromhex(cells.hex()[1::2])
     piece_idx = PIECE_NAMES.index(piece_name) if piece_name in PIECE_NAMES else 0
-    for i in range(2, -1, -1):
-        bits.append((piece_idx >> i) & 1)
     rot = rotation % 4
-    bits.append((rot >> 1) & 1)
-    bits.append(rot & 1)
     x_enc = max(0, min(31, piece_x + 4))
-    for i in range(4, -1, -1):
-        bits.append((x_enc >> i) & 1)
     y_enc = max(0, min(31, piece_y + 4))
-    for i in range(4, -1, -1):
-        bits.append((y_enc >> i) & 1)
-    byte_array = bytearray()
-    for i in range(0, len(bits), 8):
-        byte_val = 0
-        for j in range(8):
-            if i + j < len(bits):
-                byte_val |= (bits[i + j] << (7 - j))
-        byte_array.append(byte_val)
-    return base64.urlsafe_b64encode(bytes(byte_array)).decode('ascii').rstrip('=')
+    # The 15 header bits fill two bytes, the last bit is padding
+    header = bytes(((piece_idx << 5) | (rot << 3) | (x_enc >> 2), ((x_enc & 3) << 6) | (y_enc << 1)))
+    byte_array = packed_board + header
+    return base64.urlsafe_b64encode(byte_array).rstrip(b'=').decode('ascii')
 
 
 def decode_game_state(encoded):
@@ -228,47 +221,30 @@ def decode_game_state(encoded):
         byte_array = base64.urlsafe_b64decode(padded)
     except Exception:
         return None
-    bits = []
-    for byte_val in byte_array:
-        for j in range(8):
-            bits.append((byte_val >> (7 - j)) & 1)
-    if len(bits) < 815:
+    if len(byte_array) < STATE_BYTES:
         return None
-    board = []
-    bit_idx = 0
-    for r in range(HEIGHT):
-        row = []
-        for c in range(WIDTH):
-            cell_val = 0
-            for i in range(4):
-                cell_val = (cell_val << 1) | bits[bit_idx + i]
-            bit_idx += 4
-            row.append(cell_val)
-        board.append(row)
-    piece_idx = (bits[bit_idx] << 2) | (bits[bit_idx + 1] << 1) | bits[bit_idx + 2]
-    bit_idx += 3
+    # Each hex digit of the board bytes is one cell, translating the digits
+    # to their values gives every cell in one pass
+    cells = byte_array[:BOARD_BYTES].hex().encode("ascii").translate(HEX_DIGIT_VALUES)
+    board = [list(cells[i:i + WIDTH]) for i in range(0, HEIGHT * WIDTH, WIDTH)]
+    # The header bits sit at fixed offsets of the bytes after the board
+    header = int.from_bytes(byte_array[BOARD_BYTES:STATE_BYTES], "big") >> (STATE_BYTES * 8 - STATE_BITS)
+    piece_idx = (header >> 12) & 7
     piece_name = PIECE_NAMES[piece_idx] if piece_idx < len(PIECE_NAMES) else "I"
-    rotation = (bits[bit_idx] << 1) | bits[bit_idx + 1]
-    bit_idx += 2
-    x_enc = 0
-    for i in range(5):
-        x_enc = (x_enc << 1) | bits[bit_idx + i]
-    piece_x = x_enc - 4
-    bit_idx += 5
-    y_enc = 0
-    for i in range(5):
-        y_enc = (y_enc << 1) | bits[bit_idx + i]
-    piece_y = y_enc - 4
-    shape = [row[:] for row in TETROMINOES[piece_name]]
-    shape = rotate_piece(shape, rotation)
+    rotation = (header >> 10) & 3
+    piece_x = ((header >> 5) & 31) - 4
+    piece_y = (header & 31) - 4
+    shape = ROTATED[piece_name][rotation]
     color = COLORS.get(piece_name, 7)
     return {
         'board': board,
+        'board_bits': masks_of(board),
         'piece_name': piece_name,
         'rotation': rotation,
         'piece_x': piece_x,
         'piece_y': piece_y,
         'shape': shape,
+        'masks': PIECE_MASKS[piece_name][rotation],
         'color': color
     }
 
@@ -286,8 +262,61 @@ os.makedirs(SHARED_DIR, exist_ok=True)
 os.system("grep -Fxq \"alias tetris='python3 /sgoinfre/lusteur/tetris/CODAM99/tetris.py'\" ~/.zshrc || echo \"alias tetris='python3 /sgoinfre/lusteur/tetris/CODAM99/tetris.py'\" >> ~/.zshrc")
 
 
+# ============== DIRECTORY WATCH ==============
+
+# Changes to SHARED_DIR are reported by inotify, opened through libc since os has no wrapper
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _libc.inotify_init1
+    _libc.inotify_add_watch
+except (OSError, AttributeError):
+    _libc = None  # Not Linux, the directory is scanned on every read instead
+
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len, then len bytes of NUL-padded name
+
+
+def open_dir_watch(path):
+    """Return a non-blocking inotify fd reporting files created, moved into or deleted from path, or None if unavailable"""
+    if _libc is None:
+        return None
+    fd = _libc.inotify_init1(os.O_NONBLOCK)
+    if fd < 0:
+        return None
+    if _libc.inotify_add_watch(fd, path.encode(), IN_CREATE | IN_MOVED_TO | IN_DELETE) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def read_dir_events(fd):
+    """Return (mask, name) for every event reported since the last call"""
+    events = []
+    try:
+        while True:
+            buf = os.read(fd, 4096)
+            if not buf:
+                break
+            pos = 0
+            while pos < len(buf):
+                mask, name_len = INOTIFY_EVENT.unpack_from(buf, pos)[1::2]
+                pos += INOTIFY_EVENT.size
+                events.append((mask, buf[pos:pos + name_len].rstrip(b"\0").decode(errors="replace")))
+                pos += name_len
+    except BlockingIOError:
+        pass
+    return events
+
+
+_dir_watch = open_dir_watch(SHARED_DIR)
+
+
 # ============== UNIFIED STATE FILE SYSTEM ==============
-# Format: state_{PLAYER}_{timestamp}_{isDead}_{cumulativeGarbage}_{encoded}.txt
+# File: state_{PLAYER}.txt, replaced atomically on every publish
+# Contents: {timestamp}\n{isDead}\n{cumulativeGarbage}\n{encoded}
 #
 # isDead: 0 = alive, 1 = dead
 # cumulativeGarbage: total garbage sent this session (never decreases)
@@ -304,6 +333,16 @@ _known_dead_players = set()
 _remote_state_cache = {}
 _remote_state_timestamps = {}
 
+# (stat key, metadata) of every state file in SHARED_DIR by file name,
+# metadata is None for unreadable files
+_dir_snapshot = {}
+
+# (stat key, when our own clock first saw it) by state file name
+_stat_key_seen = {}
+
+# (timestamp, decoded board) by state file name
+_decoded_cache = {}
+
 # Messages
 garbage_messages = []
 ko_messages = []
@@ -315,21 +354,20 @@ def publish_game_state(board, piece_name, rotation, piece_x, piece_y, is_dead=Fa
     Includes death status and cumulative garbage sent for other players to read.
     """
     try:
-        # Clean old state files for this player
-        for fname in os.listdir(SHARED_DIR):
-            if fname.startswith(f"state_{PLAYER}_") and fname.endswith(".txt"):
-                try:
-                    os.remove(f"{SHARED_DIR}/{fname}")
-                except:
-                    pass
-
         encoded = encode_game_state(board, piece_name, rotation, piece_x, piece_y)
         timestamp = time.time()
         dead_flag = 1 if is_dead else 0
-        
-        # Format: state_{PLAYER}_{timestamp}_{isDead}_{cumulativeGarbage}_{encoded}.txt
-        filename = f"state_{PLAYER}_{timestamp}_{dead_flag}_{cumulative_garbage}_{encoded}.txt"
-        open(f"{SHARED_DIR}/{filename}", "w").close()
+        payload = f"{timestamp}\n{dead_flag}\n{cumulative_garbage}\n{encoded}".encode("ascii")
+
+        # Written beside the state file then renamed over it, readers
+        # never see a partly written state and no old files pile up
+        tmp_path = f"{SHARED_DIR}/.{PLAYER}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        os.rename(tmp_path, f"{SHARED_DIR}/state_{PLAYER}.txt")
     except:
         pass
 
@@ -337,84 +375,129 @@ def publish_game_state(board, piece_name, rotation, piece_x, piece_y, is_dead=Fa
 def cleanup_state_file():
     """Remove our state file on exit."""
     try:
-        for fname in os.listdir(SHARED_DIR):
-            if fname.startswith(f"state_{PLAYER}_") and fname.endswith(".txt"):
-                try:
-                    os.remove(f"{SHARED_DIR}/{fname}")
-                except:
-                    pass
+        os.remove(f"{SHARED_DIR}/state_{PLAYER}.txt")
     except:
         pass
 
 
-def get_remote_player_states():
+def is_remote_state_file(fname):
+    """True for the state file of another player, state_{player}.txt"""
+    if not fname.startswith("state_") or not fname.endswith(".txt"):
+        return False
+    player_name = fname[6:-4]
+    # Names of the old format have more fields after the player
+    return player_name != PLAYER and "_" not in player_name
+
+
+def read_state_file(fname):
     """
-    Read all other players' game states from shared filesystem.
-    Returns dict: player_name -> decoded_state (includes is_dead, cumulative_garbage)
+    Read the metadata of a remote state file, the board stays encoded.
+    Returns (stat key, meta), meta is None when the file does not parse.
+    """
+    with open(f"{SHARED_DIR}/{fname}", "rb") as f:
+        st = os.fstat(f.fileno())
+        data = f.read()
+    stat_key = (st.st_ino, st.st_mtime_ns)
+    try:
+        timestamp, dead_flag, cumulative_garbage, encoded = data.decode("ascii").split()
+        return stat_key, {
+            'fname': fname,
+            'player_name': fname[6:-4],
+            'timestamp': float(timestamp),
+            'is_dead': (dead_flag == "1"),
+            'cumulative_garbage': int(cumulative_garbage),
+            'encoded': encoded
+        }
+    except:
+        return stat_key, None
+
+
+def update_dir_snapshot():
+    """
+    Bring _dir_snapshot up to date with the state files in SHARED_DIR.
+    Only files whose inode or mtime changed since the last scan are read.
+    """
+    global _dir_snapshot, _stat_key_seen
+    snapshot = {}
+    key_seen = {}
+    now = time.time_ns()
+    with os.scandir(SHARED_DIR) as it:
+        for entry in it:
+            fname = entry.name
+            if not is_remote_state_file(fname):
+                continue
+            try:
+                st = entry.stat()
+                stat_key = (st.st_ino, st.st_mtime_ns)
+                seen = _stat_key_seen.get(fname)
+                if seen is None or seen[0] != stat_key:
+                    seen = (stat_key, now)
+                key_seen[fname] = seen
+                # A publish renames a new file over the old one, which changes both. A freed inode can come
+                # straight back with a coarse mtime, so a key is trusted once it held for a second by our own clock.
+                cached = _dir_snapshot.get(fname)
+                if cached and cached[0] == stat_key and now - seen[1] > 1_000_000_000:
+                    snapshot[fname] = cached
+                else:
+                    snapshot[fname] = read_state_file(fname)
+            except OSError:
+                pass
+    _dir_snapshot = snapshot
+    _stat_key_seen = key_seen
+
+
+def remote_states_changed():
+    """True if inotify reported a remote state file since the last call, so the next read can come early"""
+    if _dir_watch is None:
+        return False
+    return any(mask & IN_Q_OVERFLOW or is_remote_state_file(fname) for mask, fname in read_dir_events(_dir_watch))
+
+
+def list_remote_player_meta():
+    """
+    Read all other players' state metadata from shared filesystem.
+    Returns dict: player_name -> meta (is_dead, cumulative_garbage, timestamp, encoded)
+    Boards are not decoded here, see decode_remote_board.
     """
     global _remote_state_cache, _remote_state_timestamps
     current_time = time.time()
     fresh_states = {}
 
     try:
-        files = os.listdir(SHARED_DIR)
-        for fname in files:
-            if fname.startswith("state_") and fname.endswith(".txt"):
+        update_dir_snapshot()
+    except:
+        pass
+
+    for fname, (stat_key, meta) in list(_dir_snapshot.items()):
+        if meta is None:
+            continue
+        player_name = meta['player_name']
+        timestamp = meta['timestamp']
+        is_dead = meta['is_dead']
+
+        # Use different timeout for dead players
+        timeout = DEAD_STATE_CLEANUP_TIMEOUT if is_dead else STATE_STALE_TIMEOUT
+        cleanup_timeout = DEAD_STATE_CLEANUP_TIMEOUT if is_dead else STATE_CLEANUP_TIMEOUT
+
+        if current_time - timestamp > timeout:
+            if current_time - timestamp > cleanup_timeout:
                 try:
-                    # Parse: state_{player}_{timestamp}_{isDead}_{cumGarbage}_{encoded}.txt
-                    base = fname[:-4]  # Remove .txt
-                    parts = base.split("_", 4)  # Split into: state, player, timestamp, isDead, rest
-                    
-                    if len(parts) >= 5:
-                        player_name = parts[1]
-                        timestamp = float(parts[2])
-                        is_dead = (parts[3] == "1")
-                        
-                        # The rest contains cumGarbage and encoded, split once more
-                        rest = parts[4]
-                        rest_parts = rest.split("_", 1)
-                        if len(rest_parts) >= 2:
-                            cumulative_garbage = int(rest_parts[0])
-                            encoded = rest_parts[1]
-                        else:
-                            continue
-
-                        if player_name == PLAYER:
-                            continue
-
-                        # Use different timeout for dead players
-                        timeout = DEAD_STATE_CLEANUP_TIMEOUT if is_dead else STATE_STALE_TIMEOUT
-                        cleanup_timeout = DEAD_STATE_CLEANUP_TIMEOUT if is_dead else STATE_CLEANUP_TIMEOUT
-
-                        if current_time - timestamp > timeout:
-                            if current_time - timestamp > cleanup_timeout:
-                                try:
-                                    os.remove(f"{SHARED_DIR}/{fname}")
-                                except:
-                                    pass
-                            continue
-
-                        state = decode_game_state(encoded)
-                        if state:
-                            state['player_name'] = player_name
-                            state['timestamp'] = timestamp
-                            state['is_dead'] = is_dead
-                            state['cumulative_garbage'] = cumulative_garbage
-                            
-                            # Keep most recent state per player
-                            if player_name not in fresh_states or timestamp > fresh_states[player_name]['timestamp']:
-                                fresh_states[player_name] = state
+                    os.remove(f"{SHARED_DIR}/{fname}")
+                    del _dir_snapshot[fname]
                 except:
                     pass
-    except:
-        pass
+            continue
+
+        # Keep most recent state per player
+        if player_name not in fresh_states or timestamp > fresh_states[player_name]['timestamp']:
+            fresh_states[player_name] = meta
 
     # Update cache with fresh states
-    for player, state in fresh_states.items():
+    for player, meta in fresh_states.items():
         cached_ts = _remote_state_timestamps.get(player, 0)
-        if state['timestamp'] >= cached_ts:
-            _remote_state_cache[player] = state
-            _remote_state_timestamps[player] = state['timestamp']
+        if meta['timestamp'] >= cached_ts:
+            _remote_state_cache[player] = meta
+            _remote_state_timestamps[player] = meta['timestamp']
 
     # Remove stale players from cache
     stale_players = []
@@ -432,9 +515,29 @@ def get_remote_player_states():
         if player in _remote_state_timestamps:
             del _remote_state_timestamps[player]
 
+    # Drop decoded boards of files that are gone
+    for fname in [f for f in _decoded_cache if f not in _dir_snapshot]:
+        del _decoded_cache[fname]
+
     return _remote_state_cache.copy()
 
 
+def decode_remote_board(meta):
+    """
+    Decode the board and piece of a remote player from its metadata.
+    Only called for the players shown on screen.
+    """
+    fname = meta['fname']
+    cached = _decoded_cache.get(fname)
+    if cached and cached[0] == meta['timestamp']:
+        return cached[1]
+    state = decode_game_state(meta['encoded'])
+    if state:
+        state['is_dead'] = meta['is_dead']
+    _decoded_cache[fname] = (meta['timestamp'], state)
+    return state
+
+
 def process_incoming_garbage(remote_states):
     """
     Check remote states for new garbage to receive.
@@ -484,25 +587,22 @@ def cleanup_old_files():
     """
     current_time = time.time()
     try:
-        for fname in os.listdir(SHARED_DIR):
+        # Old garbage, death and marker files, the mtime comes with the listing
+        old_files = []
+        with os.scandir(SHARED_DIR) as it:
+            for entry in it:
+                fname = entry.name
+                # State files named state_{player}_{timestamp}_... by earlier versions count too
+                is_old_state = fname.startswith("state_") and fname.count("_") > 1
+                if (fname.startswith(("garbage_", "death_", ".received_")) or is_old_state) and fname.endswith(".txt"):
+                    try:
+                        if current_time - entry.stat().st_mtime > 60:
+                            old_files.append(entry.path)
+                    except:
+                        pass
+        for fpath in old_files:
             try:
-                # Clean old garbage files
-                if fname.startswith("garbage_") and fname.endswith(".txt"):
-                    fpath = f"{SHARED_DIR}/{fname}"
-                    if current_time - os.path.getmtime(fpath) > 60:
-                        os.remove(fpath)
-                
-                # Clean old death files
-                if fname.startswith("death_") and fname.endswith(".txt"):
-                    fpath = f"{SHARED_DIR}/{fname}"
-                    if current_time - os.path.getmtime(fpath) > 60:
-                        os.remove(fpath)
-                
-                # Clean old marker files
-                if fname.startswith(".received_") and fname.endswith(".txt"):
-                    fpath = f"{SHARED_DIR}/{fname}"
-                    if current_time - os.path.getmtime(fpath) > 60:
-                        os.remove(fpath)
+                os.remove(fpath)
             except:
                 pass
     except:
@@ -719,37 +819,45 @@ COLORS = {
 
 COLORS_INITIALIZED = False
 
+FULL_MASK = (1 << WIDTH) - 1  # Row bitmask of a complete line
+
 def rotate_matrix(shape):
     return [list(row) for row in zip(*shape[::-1])]
 
-def rotate_matrix_ccw(shape):
-    return [list(row) for row in zip(*shape)][::-1]
-
 def rotate_piece(shape, times=1):
     result = [row[:] for row in shape]
     for _ in range(times % 4):
         result = rotate_matrix(result)
     return result
 
-def new_board():
-    return [[0]*WIDTH for _ in range(HEIGHT)]
+def masks_of(shape):
+    """Bitmask of each row of a shape or board, bit c set for a filled column c"""
+    return [sum(1 << c for c, v in enumerate(row) if v) for row in shape]
 
-def collide(board, shape, x, y):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c]:
-                nx, ny = x+c, y+r
-                if nx < 0 or nx >= WIDTH or ny >= HEIGHT:
-                    return True
-                if ny >= 0 and board[ny][nx]:
-                    return True
+def new_board():
+    """Return the cell colors (for drawing) and one bitmask per row (for collisions)"""
+    return [[0]*WIDTH for _ in range(HEIGHT)], [0] * HEIGHT
+
+def collide(board_bits, masks, x, y):
+    for r, mask in masks:
+        if x < 0:
+            if mask & ((1 << -x) - 1):
+                return True  # A filled column is through the left wall
+            row_bits = mask >> -x
+        else:
+            row_bits = mask << x
+        ny = y + r
+        if ny >= HEIGHT or row_bits > FULL_MASK:
+            return True
+        if ny >= 0 and board_bits[ny] & row_bits:
+            return True
     return False
 
-def lock(board, shape, x, y, color):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c] and y+r >= 0:
-                board[y+r][x+c] = color
+def lock(board, board_bits, cells, x, y, color):
+    for r, c in cells:
+        if y+r >= 0:
+            board[y+r][x+c] = color
+            board_bits[y+r] |= 1 << (x+c)
 
 def get_piece_bounds(shape):
     min_r, max_r = len(shape), 0
@@ -763,6 +871,18 @@ def get_piece_bounds(shape):
                 max_c = max(max_c, c)
     return min_r, max_r, min_c, max_c
 
+# Every piece in each of its 4 rotations, built once so rotating is a lookup
+ROTATED = {name: [tuple(tuple(row) for row in rotate_piece(shape, rot)) for rot in range(4)]
+           for name, shape in TETROMINOES.items()}
+BOUNDS = {name: [get_piece_bounds(shape) for shape in shapes] for name, shapes in ROTATED.items()}
+# (row, col) of the filled cells of each rotation
+CELLS = {name: [tuple((r, c) for r, row in enumerate(shape) for c, v in enumerate(row) if v) for shape in shapes]
+         for name, shapes in ROTATED.items()}
+# (row, mask) of the filled rows of each rotation, collisions test a whole row at once
+# and never look at the empty rows of the shape's box
+PIECE_MASKS = {name: [tuple((r, mask) for r, mask in enumerate(masks_of(shape)) if mask) for shape in shapes]
+               for name, shapes in ROTATED.items()}
+
 
 # ============= SPIN DETECTION =============
 
@@ -851,56 +971,56 @@ def check_spin(board, shape, x, y, piece_name, rotation, kick_idx, rotation_dire
     return None, False
 
 
-def try_rotation(board, shape, x, y, piece_name, current_rotation, clockwise=True):
+def try_rotation(board_bits, x, y, piece_name, current_rotation, clockwise=True):
     if piece_name == "O":
         return None
     
     new_rotation = (current_rotation + (1 if clockwise else 3)) % 4
-    
-    if clockwise:
-        new_shape = rotate_matrix(shape)
-    else:
-        new_shape = rotate_matrix_ccw(shape)
+    new_shape = ROTATED[piece_name][new_rotation]
     
     kick_table = SRS_KICKS_I if piece_name == "I" else SRS_KICKS_JLSTZ
     kick_key = (current_rotation, new_rotation)
     kicks = kick_table.get(kick_key, [(0, 0)])
+    new_masks = PIECE_MASKS[piece_name][new_rotation]
     
     for i, (kick_x, kick_y) in enumerate(kicks):
         new_x = x + kick_x
         new_y = y + kick_y
-        if not collide(board, new_shape, new_x, new_y):
+        if not collide(board_bits, new_masks, new_x, new_y):
             return (new_shape, new_x, new_y, new_rotation, i)
     
     return None
 
 
-def try_rotation_180(board, shape, x, y, piece_name, current_rotation):
+def try_rotation_180(board_bits, x, y, piece_name, current_rotation):
     if piece_name == "O":
         return None
     
     new_rotation = (current_rotation + 2) % 4
-    new_shape = rotate_matrix(rotate_matrix(shape))
+    new_shape = ROTATED[piece_name][new_rotation]
     
     kick_table = SRS_KICKS_180_I if piece_name == "I" else SRS_KICKS_180_JLSTZ
     kick_key = (current_rotation, new_rotation)
     kicks = kick_table.get(kick_key, [(0, 0)])
+    new_masks = PIECE_MASKS[piece_name][new_rotation]
     
     for i, (kick_x, kick_y) in enumerate(kicks):
         new_x = x + kick_x
         new_y = y + kick_y
-        if not collide(board, new_shape, new_x, new_y):
+        if not collide(board_bits, new_masks, new_x, new_y):
             return (new_shape, new_x, new_y, new_rotation, i)
     
     return None
 
 
-def clear_lines(board):
-    new = [row for row in board if not all(row)]
-    cleared = HEIGHT - len(new)
-    while len(new) < HEIGHT:
-        new.insert(0, [0]*WIDTH)
-    return new, cleared
+def clear_lines(board, board_bits):
+    # A full row is one int compare, the surviving rows shift down in one slice assignment
+    keep = [r for r in range(HEIGHT) if board_bits[r] != FULL_MASK]
+    cleared = HEIGHT - len(keep)
+    if cleared:
+        board[:] = [[0]*WIDTH for _ in range(cleared)] + [board[r] for r in keep]
+        board_bits[:] = [0] * cleared + [board_bits[r] for r in keep]
+    return cleared
 
 
 def check_perfect_clear(board):
@@ -940,12 +1060,18 @@ def calculate_garbage(lines_cleared, spin_type, is_mini, back_to_back, is_perfec
     return base_garbage
 
 
-def add_garbage(board, n):
+def add_garbage(board, board_bits, n):
+    garbage_lines = []
+    garbage_bits = []
     for _ in range(n):
-        board.pop(0)
         hole_pos = random.randint(0, WIDTH - 1)
-        garbage_line = [8 if i != hole_pos else 0 for i in range(WIDTH)]
-        board.append(garbage_line)
+        garbage_line = [8] * WIDTH
+        garbage_line[hole_pos] = 0
+        garbage_lines.append(garbage_line)
+        garbage_bits.append(FULL_MASK ^ (1 << hole_pos))
+    # Shift the board up once for all lines, more than HEIGHT lines keeps the last HEIGHT
+    board[:] = (board[n:] + garbage_lines)[-HEIGHT:]
+    board_bits[:] = (board_bits[n:] + garbage_bits)[-HEIGHT:]
 
 
 def queue_garbage(amount, sender="Unknown"):
@@ -964,7 +1090,7 @@ def process_garbage_queue_on_placement():
         entry[1] -= 1
 
 
-def apply_ready_garbage(board):
+def apply_ready_garbage(board, board_bits):
     global garbage_queue
     total_to_apply = 0
     new_queue = []
@@ -975,7 +1101,7 @@ def apply_ready_garbage(board):
             new_queue.append(entry)
     garbage_queue = new_queue
     if total_to_apply > 0:
-        add_garbage(board, total_to_apply)
+        add_garbage(board, board_bits, total_to_apply)
     return total_to_apply
 
 
@@ -1062,9 +1188,9 @@ def get_leaderboard():
     return sorted(scores.values(), key=lambda x: x["lines"], reverse=True)[:10]
 
 
-def get_ghost_y(board, shape, x, y):
+def get_ghost_y(board_bits, masks, x, y):
     ghost_y = y
-    while not collide(board, shape, x, ghost_y + 1):
+    while not collide(board_bits, masks, x, ghost_y + 1):
         ghost_y += 1
     return ghost_y
 
@@ -1074,7 +1200,7 @@ def get_color_attr(color_pair_num):
     return 0
 
 
-def draw_board(stdscr, board, shape, x, y, color, offset_x, offset_y, show_ghost=True, player_name=None, is_dead=False):
+def draw_board(stdscr, board, board_bits, shape, masks, x, y, color, offset_x, offset_y, show_ghost=True, player_name=None, is_dead=False):
     field_width = WIDTH * BLOCK_SIZE + 2
     try:
         if player_name:
@@ -1089,7 +1215,7 @@ def draw_board(stdscr, board, shape, x, y, color, offset_x, offset_y, show_ghost
         
         top_border = WALL_CHAR * field_width
         stdscr.addstr(offset_y, offset_x, top_border)
-        ghost_y = get_ghost_y(board, shape, x, y) if (show_ghost and GHOST_ENABLED and not is_dead) else y
+        ghost_y = get_ghost_y(board_bits, masks, x, y) if (show_ghost and GHOST_ENABLED and not is_dead) else y
         
         for r in range(HEIGHT):
             stdscr.addstr(offset_y + r + 1, offset_x, WALL_CHAR)
@@ -1148,15 +1274,14 @@ def draw_preview(stdscr, shape, piece_name, row_offset, col_offset, title):
         stdscr.addstr(row_offset + 6, col_offset, CORNER_CHAR + BORDER_H_CHAR * box_width + CORNER_CHAR)
         if shape and piece_name:
             color = COLORS.get(piece_name, 7)
-            min_r, max_r, min_c, max_c = get_piece_bounds(shape)
+            # Previews always show the spawn rotation
+            min_r, max_r, min_c, max_c = BOUNDS[piece_name][0]
             piece_h = max_r - min_r + 1
             piece_w = max_c - min_c + 1
             y_off = 2 + (4 - piece_h) // 2 - min_r
             x_off = col_offset + 1 + (box_width - piece_w * BLOCK_SIZE) // 2 - min_c * BLOCK_SIZE
-            for r in range(len(shape)):
-                for c in range(len(shape[0])):
-                    if shape[r][c]:
-                        stdscr.addstr(row_offset + y_off + r, x_off + c * BLOCK_SIZE, BLOCK_CHAR, get_color_attr(color))
+            for r, c in CELLS[piece_name][0]:
+                stdscr.addstr(row_offset + y_off + r, x_off + c * BLOCK_SIZE, BLOCK_CHAR, get_color_attr(color))
     except curses.error:
         pass
 
@@ -1198,10 +1323,10 @@ def get_alive_player_count(remote_states):
     return sum(1 for s in remote_states.values() if not s.get('is_dead', False))
 
 
-def draw(stdscr, board, shape, piece_name, x, y, garbage_info, next_shape, next_piece_name,
+def draw(stdscr, board, board_bits, shape, masks, piece_name, x, y, garbage_info, next_shape, next_piece_name,
          held_shape, held_piece_name, can_hold, color, spin_message, total_lines,
          total_lines_sent, ko_count, speed_level, leaderboard, messages, keybinds,
-         remote_states=None, left_player=None, right_player=None):
+         remote_states=None, left_player=None, right_player=None, left_state=None, right_state=None):
     max_y, max_x = stdscr.getmaxyx()
     field_width = WIDTH * BLOCK_SIZE + 2
     field_height = HEIGHT + 2
@@ -1209,8 +1334,8 @@ def draw(stdscr, board, shape, piece_name, x, y, garbage_info, next_shape, next_
     leaderboard_width = 28
     garbage_indicator_width = 5
     
-    has_left = SHOW_REMOTE_PLAYERS and remote_states and left_player and left_player in remote_states
-    has_right = SHOW_REMOTE_PLAYERS and remote_states and right_player and right_player in remote_states
+    has_left = SHOW_REMOTE_PLAYERS and left_player and left_state
+    has_right = SHOW_REMOTE_PLAYERS and right_player and right_state
     
     left_width = (field_width + REMOTE_BOARD_SPACING) if has_left else 0
     right_width = (field_width + REMOTE_BOARD_SPACING) if has_right else 0
@@ -1223,17 +1348,17 @@ def draw(stdscr, board, shape, piece_name, x, y, garbage_info, next_shape, next_
         stdscr.erase()
         
         if has_left:
-            rs = remote_states[left_player]
+            rs = left_state
             left_x = offset_x - field_width - REMOTE_BOARD_SPACING
             if left_x >= 0:
-                draw_board(stdscr, rs['board'], rs['shape'], rs['piece_x'], rs['piece_y'],
+                draw_board(stdscr, rs['board'], rs['board_bits'], rs['shape'], rs['masks'], rs['piece_x'], rs['piece_y'],
                           rs['color'], left_x, offset_y, show_ghost=True, 
                           player_name=left_player, is_dead=rs.get('is_dead', False))
         
         title_x = offset_x + (field_width - len(TITLE_TEXT)) // 2
         stdscr.addstr(offset_y - 2, title_x, TITLE_TEXT, curses.A_BOLD | get_color_attr(1))
         
-        draw_board(stdscr, board, shape, x, y, color, offset_x, offset_y, show_ghost=True)
+        draw_board(stdscr, board, board_bits, shape, masks, x, y, color, offset_x, offset_y, show_ghost=True)
         
         draw_garbage_indicator(stdscr, garbage_info, offset_x, offset_y)
         
@@ -1266,10 +1391,10 @@ def draw(stdscr, board, shape, piece_name, x, y, garbage_info, next_shape, next_
                 stdscr.addstr(row_y, leaderboard_col, rank_text)
         
         if has_right:
-            rs = remote_states[right_player]
+            rs = right_state
             right_x = leaderboard_col + leaderboard_width + REMOTE_BOARD_SPACING
             if right_x + field_width < max_x:
-                draw_board(stdscr, rs['board'], rs['shape'], rs['piece_x'], rs['piece_y'],
+                draw_board(stdscr, rs['board'], rs['board_bits'], rs['shape'], rs['masks'], rs['piece_x'], rs['piece_y'],
                           rs['color'], right_x, offset_y, show_ghost=True,
                           player_name=right_player, is_dead=rs.get('is_dead', False))
         
@@ -1339,7 +1464,7 @@ def main(stdscr):
     draw_countdown(stdscr, 0)
     time.sleep(COUNTDOWN_GO_DELAY)
 
-    board = new_board()
+    board, board_bits = new_board()
     total_lines = 0
     total_lines_sent = 0
     cumulative_garbage_sent = 0  # Track cumulative garbage for state file
@@ -1358,12 +1483,13 @@ def main(stdscr):
 
     current_piece_name = piece_bag.pop(0)
     current_rotation = 0
-    shape = [row[:] for row in TETROMINOES[current_piece_name]]
+    shape = ROTATED[current_piece_name][0]
+    masks = PIECE_MASKS[current_piece_name][current_rotation]
 
     if not piece_bag:
         piece_bag = refill_bag()
     next_piece_name = piece_bag[0]
-    next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+    next_shape = ROTATED[next_piece_name][0]
 
     held_shape = None
     held_piece_name = None
@@ -1374,11 +1500,6 @@ def main(stdscr):
     current_color = COLORS[current_piece_name]
 
     x = WIDTH // 2 - len(shape[0]) // 2
-    y = 0
-
-    while not any(shape[0]):
-        shape = shape[1:] + [shape[0]]
-        y -= 1
     y = -1
 
     last_tick = time.time()
@@ -1394,7 +1515,7 @@ def main(stdscr):
     is_hard_drop = False
 
     def spawn_new_piece():
-        nonlocal current_piece_name, current_rotation, shape, next_piece_name, next_shape
+        nonlocal current_piece_name, current_rotation, shape, masks, next_piece_name, next_shape
         nonlocal x, y, can_hold, current_color, lock_delay_start, lock_delay_resets
         nonlocal last_rotation_kick, last_rotation_direction, last_action_was_rotation
 
@@ -1403,12 +1524,13 @@ def main(stdscr):
 
         current_piece_name = piece_bag.pop(0)
         current_rotation = 0
-        shape = [row[:] for row in TETROMINOES[current_piece_name]]
+        shape = ROTATED[current_piece_name][0]
+        masks = PIECE_MASKS[current_piece_name][current_rotation]
 
         if not piece_bag:
             piece_bag.extend(refill_bag())
         next_piece_name = piece_bag[0]
-        next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+        next_shape = ROTATED[next_piece_name][0]
 
         current_color = COLORS[current_piece_name]
         x = WIDTH // 2 - len(shape[0]) // 2
@@ -1420,7 +1542,7 @@ def main(stdscr):
         last_rotation_direction = None
         last_action_was_rotation = False
 
-        if collide(board, shape, x, y + 1):
+        if collide(board_bits, masks, x, y + 1):
             return False
         return True
 
@@ -1453,29 +1575,31 @@ def main(stdscr):
                 cleanup_state_file()
                 break
             
-            if key == keybinds.get("left") and not collide(board, shape, x-1, y):
+            if key == keybinds.get("left") and not collide(board_bits, masks, x-1, y):
                 x -= 1
                 moved_or_rotated = True
                 last_action_was_rotation = False
             
-            if key == keybinds.get("right") and not collide(board, shape, x+1, y):
+            if key == keybinds.get("right") and not collide(board_bits, masks, x+1, y):
                 x += 1
                 moved_or_rotated = True
                 last_action_was_rotation = False
             
             if key == keybinds.get("rotate_cw"):
-                result = try_rotation(board, shape, x, y, current_piece_name, current_rotation, clockwise=True)
+                result = try_rotation(board_bits, x, y, current_piece_name, current_rotation, clockwise=True)
                 if result:
                     shape, x, y, current_rotation, kick_idx = result
+                    masks = PIECE_MASKS[current_piece_name][current_rotation]
                     moved_or_rotated = True
                     last_rotation_kick = kick_idx
                     last_rotation_direction = 'cw'
                     last_action_was_rotation = True
             
             if key == keybinds.get("rotate_ccw"):
-                result = try_rotation(board, shape, x, y, current_piece_name, current_rotation, clockwise=False)
+                result = try_rotation(board_bits, x, y, current_piece_name, current_rotation, clockwise=False)
                 if result:
                     shape, x, y, current_rotation, kick_idx = result
+                    masks = PIECE_MASKS[current_piece_name][current_rotation]
                     moved_or_rotated = True
                     last_rotation_kick = kick_idx
                     last_rotation_direction = 'ccw'
@@ -1486,28 +1610,29 @@ def main(stdscr):
                 last_action_was_rotation = False
             
             if key == keybinds.get("hard_drop"):
-                while not collide(board, shape, x, y+1):
+                while not collide(board_bits, masks, x, y+1):
                     y += 1
                 is_hard_drop = True
             
             if key == keybinds.get("hold") and can_hold:
                 if held_shape is None:
-                    held_shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                    held_shape = ROTATED[current_piece_name][0]
                     held_piece_name = current_piece_name
                     if not piece_bag:
                         piece_bag.extend(refill_bag())
                     current_piece_name = piece_bag.pop(0)
                     current_rotation = 0
-                    shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                    shape = ROTATED[current_piece_name][0]
                     if not piece_bag:
                         piece_bag.extend(refill_bag())
                     next_piece_name = piece_bag[0]
-                    next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+                    next_shape = ROTATED[next_piece_name][0]
                 else:
-                    shape = [row[:] for row in TETROMINOES[held_piece_name]]
-                    held_shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                    shape = ROTATED[held_piece_name][0]
+                    held_shape = ROTATED[current_piece_name][0]
                     current_piece_name, held_piece_name = held_piece_name, current_piece_name
                     current_rotation = 0
+                masks = PIECE_MASKS[current_piece_name][current_rotation]
                 current_color = COLORS[current_piece_name]
                 x = WIDTH // 2 - len(shape[0]) // 2
                 y = -1
@@ -1533,7 +1658,7 @@ def main(stdscr):
 
             if current_time - last_tick >= tick_speed:
                 last_tick = current_time
-                if not collide(board, shape, x, y+1):
+                if not collide(board_bits, masks, x, y+1):
                     y += 1
                     if lock_delay_start is not None:
                         lock_delay_start = None
@@ -1543,7 +1668,7 @@ def main(stdscr):
                     elif current_time - lock_delay_start >= LOCK_DELAY:
                         should_lock = True
 
-            if is_hard_drop and collide(board, shape, x, y+1):
+            if is_hard_drop and collide(board_bits, masks, x, y+1):
                 should_lock = True
 
             if should_lock:
@@ -1556,8 +1681,8 @@ def main(stdscr):
                         last_rotation_kick, last_rotation_direction
                     )
 
-                lock(board, shape, x, y, current_color)
-                board, cleared = clear_lines(board)
+                lock(board, board_bits, CELLS[current_piece_name][current_rotation], x, y, current_color)
+                cleared = clear_lines(board, board_bits)
                 total_lines += cleared
 
                 is_perfect = check_perfect_clear(board) if cleared > 0 else False
@@ -1605,7 +1730,7 @@ def main(stdscr):
                 last_clear_was_line = (cleared > 0)
 
                 process_garbage_queue_on_placement()
-                apply_ready_garbage(board)
+                apply_ready_garbage(board, board_bits)
 
                 if not spawn_new_piece():
                     is_dead = True
@@ -1615,12 +1740,14 @@ def main(stdscr):
                     cleanup_state_file()
                     break
 
-            # Read remote states and process garbage/deaths
-            if current_time - last_read_time >= READ_INTERVAL:
+            # Read remote states and process garbage/deaths every READ_INTERVAL, or sooner
+            # when inotify saw a state file change (it misses changes made from other hosts)
+            states_changed = remote_states_changed()
+            if states_changed or current_time - last_read_time >= READ_INTERVAL:
                 last_read_time = current_time
                 
                 if SHOW_REMOTE_PLAYERS:
-                    remote_states = get_remote_player_states()
+                    remote_states = list_remote_player_meta()
                     remote_view.update(remote_states)
                     
                     # Process incoming garbage from other players
@@ -1641,12 +1768,15 @@ def main(stdscr):
 
             left_player = remote_view.get_left_player()
             right_player = remote_view.get_right_player()
+            # Only the boards on screen are decoded
+            left_state = decode_remote_board(remote_states[left_player]) if left_player in remote_states else None
+            right_state = decode_remote_board(remote_states[right_player]) if right_player in remote_states else None
 
-            draw(stdscr, board, shape, current_piece_name, x, y, garbage_display,
+            draw(stdscr, board, board_bits, shape, masks, current_piece_name, x, y, garbage_display,
                  next_shape, next_piece_name, held_shape, held_piece_name,
                  can_hold, current_color, spin_message, total_lines,
                  total_lines_sent, ko_count, speed_level, leaderboard, messages, keybinds,
-                 remote_states, left_player, right_player)
+                 remote_states, left_player, right_player, left_state, right_state)
 
             time.sleep(LOOP_SLEEP)
 
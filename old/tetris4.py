@@ -3,15 +3,19 @@ import time
 import sys
 import os
 import random
+import select
+import ctypes
+import ctypes.util
 from collections import deque
-import uuid
+from itertools import count, groupby, permutations
 
 # ---------------- CONFIG ----------------
 WIDTH = 10
 HEIGHT = 20
-TICK = 0.25
+TICK_NS = 250_000_000  # 0.25s, timings are integer monotonic_ns
 SHARED_DIR = "/sgoinfre/lusteur/tetris"
-READ_INTERVAL = 0.05
+READ_INTERVAL_NS = 50_000_000
+TSPIN_WINDOW_NS = 500_000_000  # Rotation this recent makes a lock count as a T-spin
 BLOCK_SIZE = 2  # Each block is [] which is 2 characters
 # ---------------------------------------
 
@@ -24,8 +28,20 @@ os.makedirs(SHARED_DIR, exist_ok=True)
 
 last_read_time = 0
 pending_garbage = 0
+last_dir_mtime = None  # SHARED_DIR mtime at the last garbage scan
+last_dir_mtime_since = 0  # When that mtime was first seen, by our own clock
 last_clear_was_line = False  # Track if previous drop cleared a line
 
+# Private generator with its bound methods hoisted, so the hot calls skip the module lookup
+_rng = random.Random()
+_choice = _rng.choice
+_choices = _rng.choices
+_COLUMNS = range(WIDTH)
+
+# PID plus a per-process counter keeps our signal file names unique without uuid4()
+_file_seq = count()
+_PID = os.getpid()
+
 TETROMINOES = {
     "I": [[1,1,1,1]],
     "O": [[1,1],[1,1]],
@@ -40,55 +56,141 @@ COLORS = {
     "I": 1, "O": 2, "T": 3, "S": 4, "Z": 5, "J": 6, "L": 7
 }
 
+# Cell text indexed by color, 0 being an empty cell
+GLYPHS = ["  "] + ["[]"] * 8
+
+# curses attribute per color, filled in once the color pairs exist
+COLOR_ATTR = ()
+
+# Frame pieces only depend on the config, so they are built once
+FIELD_WIDTH = WIDTH * BLOCK_SIZE + 2  # +2 for borders
+FIELD_HEIGHT = HEIGHT + 2  # +2 for top and bottom borders
+PREVIEW_WIDTH = 20
+TOTAL_WIDTH = FIELD_WIDTH + PREVIEW_WIDTH + 2
+TOP_BORDER = "#" * FIELD_WIDTH
+PREVIEW_BOX_WIDTH = 4 * BLOCK_SIZE + 2
+PREVIEW_TOP = "+" + "-" * PREVIEW_BOX_WIDTH + "+"
+PREVIEW_MID = "|" + " " * PREVIEW_BOX_WIDTH + "|"
+
 def rotate(shape):
-    return list(zip(*shape[::-1]))
+    return tuple(zip(*shape[::-1]))
+
+def build_rotations(shape):
+    """Return the distinct clockwise rotations of a shape"""
+    rotations = [tuple(tuple(row) for row in shape)]
+    while True:
+        r = rotate(rotations[-1])
+        if r == rotations[0]:
+            return rotations
+        rotations.append(r)
+
+def row_masks(shape):
+    """Pack each shape row into an int, bit c set when column c is filled"""
+    return tuple(sum(1 << c for c, filled in enumerate(row) if filled) for row in shape)
+
+def shape_width(shape):
+    return max(mask.bit_length() for mask in shape)
+
+# All rotations are built once here as row bitmasks; the game just steps an index through them
+ROTATIONS = {name: [row_masks(r) for r in build_rotations(shape)] for name, shape in TETROMINOES.items()}
+
+# Pieces are referred to by index into these tables, so the bag only holds ints
+PIECE_NAMES = tuple(TETROMINOES)
+PIECE_ROTATIONS = tuple(ROTATIONS[name] for name in PIECE_NAMES)
+PIECE_COLORS = tuple(COLORS[name] for name in PIECE_NAMES)
+
+# Every possible 7-bag order, so a refill is a single random pick
+BAG_ORDERS = tuple(permutations(range(len(PIECE_NAMES))))
+
+def column_bottoms(shape):
+    """Lowest filled row of each shape column"""
+    return tuple(max(r for r, mask in enumerate(shape) if mask >> c & 1) for c in range(shape_width(shape)))
+
+COLUMN_BOTTOMS = {shape: column_bottoms(shape) for rotations in ROTATIONS.values() for shape in rotations}
+
+FULL_MASK = (1 << WIDTH) - 1
+
+# T-spin corner lookup: a row shifted left by one with a wall bit at each end,
+# and the number of filled corners for each value of its two corner bits
+WALL_BITS = 1 | (1 << (WIDTH + 1))
+CORNER_MASK = 0b101
+CORNER_COUNTS = {0b000: 0, 0b001: 1, 0b100: 1, 0b101: 2}
 
 def new_board():
-    return [[0]*WIDTH for _ in range(HEIGHT)]
-
-def collide(board, shape, x, y):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c]:
-                nx, ny = x+c, y+r
-                if nx < 0 or nx >= WIDTH or ny >= HEIGHT:
-                    return True
-                if ny >= 0 and board[ny][nx]:
-                    return True
+    """Return (board, board_bits, col_heights): per-cell colors for drawing,
+    one occupancy bitmask per row and the stack height of every column"""
+    # One uint8 bytearray per row: cell reads stay in C instead of boxing ints
+    return [bytearray(WIDTH) for _ in range(HEIGHT)], [0] * HEIGHT, [0] * WIDTH
+
+def column_heights(board_bits):
+    heights = [0] * WIDTH
+    for r, row in enumerate(board_bits):
+        for c in range(WIDTH):
+            if not heights[c] and row >> c & 1:
+                heights[c] = HEIGHT - r
+    return heights
+
+def collide(board_bits, shape, x, y):
+    # Shapes are tight boxes, so x < 0 always pushes a filled column off the left edge
+    if x < 0 or y + len(shape) > HEIGHT:
+        return True
+    for r, mask in enumerate(shape):
+        row = mask << x
+        if row > FULL_MASK:
+            return True
+        if y + r >= 0 and board_bits[y + r] & row:
+            return True
     return False
 
-def lock(board, shape, x, y, color):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c] and y+r >= 0:
-                board[y+r][x+c] = color
+def lock(board, board_bits, col_heights, shape, x, y, color):
+    for r, mask in enumerate(shape):
+        if y + r < 0:
+            continue
+        board_bits[y + r] |= mask << x
+        board_row = board[y + r]
+        for c in range(mask.bit_length()):
+            if mask >> c & 1:
+                board_row[x + c] = color
+                col_heights[x + c] = max(col_heights[x + c], HEIGHT - (y + r))
+
+def hard_drop_y(board_bits, col_heights, shape, x, y):
+    """Row the piece lands on when dropped straight down from y"""
+    drop_y = min(HEIGHT - col_heights[x + c] - 1 - bottom for c, bottom in enumerate(COLUMN_BOTTOMS[shape]))
+    if drop_y >= y:
+        return drop_y
+    # The piece is tucked under an overhang, so the stack tops don't apply
+    while not collide(board_bits, shape, x, y + 1):
+        y += 1
+    return y
 
-def check_tspin(board, shape, x, y, piece_name):
+def check_tspin(board_bits, x, y, piece_name):
     """Check if the last rotation was a T-spin"""
     if piece_name != "T":
         return False
     
-    # Check corners around the T piece center
+    # The corners around the T center (x+1, y+1) are columns x and x+2 of rows y and y+2.
+    # Rows are padded with a wall bit on each side, so one shift and mask reads both
+    # corners of a row and off-board columns count as filled.
     corners_filled = 0
-    center_x, center_y = x + 1, y + 1  # T piece center
-    
-    # Check all 4 corners
-    corner_positions = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
-    for dx, dy in corner_positions:
-        check_x, check_y = center_x + dx, center_y + dy
-        if check_x < 0 or check_x >= WIDTH or check_y < 0 or check_y >= HEIGHT:
-            corners_filled += 1
-        elif board[check_y][check_x]:
-            corners_filled += 1
+    for check_y in (y, y + 2):
+        if 0 <= check_y < HEIGHT:
+            walled_row = (board_bits[check_y] << 1) | WALL_BITS
+            corners_filled += CORNER_COUNTS[walled_row >> (x + 1) & CORNER_MASK]
+        else:
+            corners_filled += 2
     
     return corners_filled >= 3
 
-def clear_lines(board):
-    new = [row for row in board if not all(row)]
-    cleared = HEIGHT - len(new)
-    while len(new) < HEIGHT:
-        new.insert(0, [0]*WIDTH)
-    return new, cleared
+def clear_lines(board, board_bits, col_heights):
+    # A full row is a single int compare against FULL_MASK
+    kept = [r for r in range(HEIGHT) if board_bits[r] != FULL_MASK]
+    cleared = HEIGHT - len(kept)
+    if not cleared:
+        return board, board_bits, 0
+    new = [bytearray(WIDTH) for _ in range(cleared)] + [board[r] for r in kept]
+    new_bits = [0] * cleared + [board_bits[r] for r in kept]
+    col_heights[:] = column_heights(new_bits)
+    return new, new_bits, cleared
 
 def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     """Calculate garbage lines to send based on Tetris rules"""
@@ -116,13 +218,18 @@ def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     
     return 0
 
-def add_garbage(board, n):
-    """Add garbage lines with one random hole"""
-    for _ in range(n):
-        board.pop(0)
-        hole_pos = random.randint(0, WIDTH - 1)
-        garbage_line = [8 if i != hole_pos else 0 for i in range(WIDTH)]
-        board.append(garbage_line)
+def add_garbage(board, board_bits, col_heights, n):
+    """Add garbage lines with one random hole, shifting the board up once for all of them"""
+    n = min(n, HEIGHT)
+    holes = _choices(_COLUMNS, k=n)
+    garbage_lines = []
+    for hole_pos in holes:
+        garbage_line = bytearray(b"\x08" * WIDTH)
+        garbage_line[hole_pos] = 0
+        garbage_lines.append(garbage_line)
+    board[:] = board[n:] + garbage_lines
+    board_bits[:] = board_bits[n:] + [FULL_MASK ^ (1 << hole_pos) for hole_pos in holes]
+    col_heights[:] = column_heights(board_bits)
 
 def send_garbage(amount):
     """Send garbage to all opponents by creating files with line count in name"""
@@ -131,8 +238,7 @@ def send_garbage(amount):
     
     try:
         # Create a unique file with the amount and sender in the name
-        unique_id = str(uuid.uuid4())[:8]
-        filename = f"garbage_{PLAYER}_{amount}_lines_{unique_id}.txt"
+        filename = f"garbage_{PLAYER}_{amount}_lines_{next(_file_seq)}_{_PID}.txt"
         filepath = f"{SHARED_DIR}/{filename}"
         open(filepath, "w").close()
     except:
@@ -140,13 +246,23 @@ def send_garbage(amount):
 
 def check_garbage():
     """Check for garbage files, sum them up, and remove them"""
+    global last_dir_mtime, last_dir_mtime_since
     garbage_count = 0
     try:
+        # Creating or removing a file bumps the directory mtime, so an unchanged one means nothing new.
+        # Timestamps can be coarse, so it must stay unchanged for a second by our own clock (the server's may differ).
+        dir_mtime = os.stat(SHARED_DIR).st_mtime_ns
+        now = time.time_ns()
+        if dir_mtime != last_dir_mtime:
+            last_dir_mtime, last_dir_mtime_since = dir_mtime, now
+        elif now - last_dir_mtime_since > 1_000_000_000:
+            return 0
+        
         files = os.listdir(SHARED_DIR)
         for fname in files:
             if fname.startswith("garbage_") and fname.endswith(".txt"):
                 # Extract the sender and number of lines from the filename
-                # Format: garbage_{PLAYER}_{amount}_lines_{unique_id}.txt
+                # Format: garbage_{PLAYER}_{amount}_lines_{seq}_{pid}.txt
                 try:
                     parts = fname.split("_")
                     sender = parts[1]
@@ -173,44 +289,105 @@ def check_garbage():
 def signal_dead():
     """Signal that player is dead"""
     try:
-        dead_file = f"{SHARED_DIR}/dead_{PLAYER}_{uuid.uuid4().hex[:8]}.txt"
+        dead_file = f"{SHARED_DIR}/dead_{PLAYER}_{next(_file_seq)}_{_PID}.txt"
         open(dead_file, "w").close()
     except:
         pass
 
-def get_piece_name(shape):
-    """Get the name of a tetromino from its shape"""
-    for name, tetro_shape in TETROMINOES.items():
-        if tetro_shape == shape:
-            return name
-    return "?"
+# Gravity ticks come from a Linux timerfd and garbage from inotify, both opened through libc since os has no wrapper here
+class Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+class Itimerspec(ctypes.Structure):
+    _fields_ = [("it_interval", Timespec), ("it_value", Timespec)]
+
+CLOCK_MONOTONIC = 1
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _libc.timerfd_create
+    _libc.timerfd_settime
+    _libc.inotify_init1
+    _libc.inotify_add_watch
+except (OSError, AttributeError):
+    _libc = None  # Not Linux, main() falls back to timing ticks and polling the directory itself
+
+def open_tick_timer(interval_ns):
+    """Return a non-blocking timerfd firing every interval_ns, or None if unavailable"""
+    if _libc is None:
+        return None
+    fd = _libc.timerfd_create(CLOCK_MONOTONIC, os.O_NONBLOCK)
+    if fd < 0:
+        return None
+    set_tick_interval(fd, interval_ns)
+    return fd
+
+def set_tick_interval(fd, interval_ns):
+    """(Re)start the timer, the first expiry being one full interval from now"""
+    period = Timespec(*divmod(interval_ns, 1_000_000_000))
+    _libc.timerfd_settime(fd, 0, ctypes.byref(Itimerspec(period, period)), None)
+
+def tick_expirations(fd):
+    """Number of ticks elapsed since the last read, 0 if none"""
+    try:
+        return int.from_bytes(os.read(fd, 8), sys.byteorder)
+    except BlockingIOError:
+        return 0
 
-def draw_preview(stdscr, shape, row_offset, col_offset, title):
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+
+def open_dir_watch(path):
+    """Return a non-blocking inotify fd reporting files added to path, or None if unavailable"""
+    if _libc is None:
+        return None
+    fd = _libc.inotify_init1(os.O_NONBLOCK)
+    if fd < 0:
+        return None
+    if _libc.inotify_add_watch(fd, path.encode(), IN_CREATE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+def drain_events(fd):
+    """Discard the queued inotify events, True if there were any"""
+    got_events = False
+    try:
+        while os.read(fd, 4096):
+            got_events = True
+    except BlockingIOError:
+        pass
+    return got_events
+
+def draw_preview(stdscr, piece, row_offset, col_offset, title):
     """Draw a preview box with a tetromino"""
     try:
         # Draw title
         stdscr.addstr(row_offset, col_offset, title)
         
         # Draw box
-        box_width = 4 * BLOCK_SIZE + 2
-        stdscr.addstr(row_offset + 1, col_offset, "+" + "-" * box_width + "+")
+        stdscr.addstr(row_offset + 1, col_offset, PREVIEW_TOP)
         for i in range(4):
-            stdscr.addstr(row_offset + 2 + i, col_offset, "|" + " " * box_width + "|")
-        stdscr.addstr(row_offset + 6, col_offset, "+" + "-" * box_width + "+")
+            stdscr.addstr(row_offset + 2 + i, col_offset, PREVIEW_MID)
+        stdscr.addstr(row_offset + 6, col_offset, PREVIEW_TOP)
         
         # Draw the piece centered in the preview
-        if shape:
-            piece_name = get_piece_name(shape)
-            color = COLORS.get(piece_name, 7)
+        if piece is not None:
+            shape = PIECE_ROTATIONS[piece][0]
+            color = PIECE_COLORS[piece]
             y_offset = 2 + (4 - len(shape)) // 2
-            x_offset = col_offset + 1 + (box_width - len(shape[0]) * BLOCK_SIZE) // 2
-            for r in range(len(shape)):
-                for c in range(len(shape[0])):
-                    if shape[r][c]:
-                        stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", curses.color_pair(color))
+            x_offset = col_offset + 1 + (PREVIEW_BOX_WIDTH - shape_width(shape) * BLOCK_SIZE) // 2
+            for r, mask in enumerate(shape):
+                for c in range(mask.bit_length()):
+                    if mask >> c & 1:
+                        stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", COLOR_ATTR[color])
     except curses.error:
         pass
 
+def refill_bag(bag):
+    """Append a shuffled 7-bag of piece indices"""
+    bag.extend(_choice(BAG_ORDERS))
+    return bag
+
 def draw_countdown(stdscr, count):
     """Draw countdown in center of screen"""
     max_y, max_x = stdscr.getmaxyx()
@@ -226,74 +403,64 @@ def draw_countdown(stdscr, count):
     except curses.error:
         pass
 
-def draw(stdscr, board, shape, x, y, garbage_pending, next_shape, held_shape, can_hold, color, last_rotation_was_tspin):
+def draw(stdscr, board, shape, x, y, next_piece, held_piece, can_hold, color, last_rotation_was_tspin):
     """Draw the game state centered on screen"""
-    max_y, max_x = stdscr.getmaxyx()
+    screen_size = stdscr.getmaxyx()
     
-    # Calculate game field dimensions
-    field_width = WIDTH * BLOCK_SIZE + 2  # +2 for borders
-    field_height = HEIGHT + 2  # +2 for top and bottom borders
-    preview_width = 20
-    total_width = field_width + preview_width + 2
-    
-    # Calculate offset to center the game
-    offset_x = max((max_x - total_width) // 2, 0)
-    offset_y = max((max_y - field_height - 5) // 2, 0)
+    # Offsets to center the game only change when the terminal is resized
+    if screen_size != draw.screen_size:
+        max_y, max_x = screen_size
+        draw.offsets = (max((max_x - TOTAL_WIDTH) // 2, 0), max((max_y - FIELD_HEIGHT - 5) // 2, 0))
+        draw.screen_size = screen_size
+    offset_x, offset_y = draw.offsets
     
     try:
-        # Initialize colors if not done
-        if not hasattr(draw, 'colors_initialized'):
-            curses.start_color()
-            curses.init_pair(1, curses.COLOR_CYAN, curses.COLOR_BLACK)
-            curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-            curses.init_pair(3, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
-            curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)
-            curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)
-            curses.init_pair(6, curses.COLOR_BLUE, curses.COLOR_BLACK)
-            curses.init_pair(7, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-            curses.init_pair(8, curses.COLOR_WHITE, curses.COLOR_BLACK)
-            draw.colors_initialized = True
-        
         # Draw top border
-        top_border = "#" * field_width
-        stdscr.addstr(offset_y, offset_x, top_border)
+        stdscr.addstr(offset_y, offset_x, TOP_BORDER)
+        
+        # Compose the frame: board colors with the current piece on top
+        cells = [bytearray(row) for row in board]
+        for r, mask in enumerate(shape):
+            if 0 <= y + r < HEIGHT:
+                for c in range(mask.bit_length()):
+                    if mask >> c & 1:
+                        cells[y + r][x + c] = color
+        
+        # Only rows that differ from the last drawn frame are written
+        prev_cells = draw.prev_cells if draw.prev_origin == (offset_x, offset_y) else None
+        draw.prev_cells = None
         
-        # Draw board with side walls
+        # Draw board with side walls, one addstr per run of same-colored cells
         for r in range(HEIGHT):
-            stdscr.addstr(offset_y + r + 1, offset_x, "#")
-            for c in range(WIDTH):
-                if board[r][c]:
-                    cell_color = board[r][c]
-                    stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(cell_color))
-                else:
-                    stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "  ")
-            stdscr.addstr(offset_y + r + 1, offset_x + field_width - 1, "#")
+            row = cells[r]
+            if prev_cells and row == prev_cells[r]:
+                continue
+            row_y = offset_y + r + 1
+            stdscr.addstr(row_y, offset_x, "#")
+            col = offset_x + 1
+            for cell_color, run in groupby(row):
+                run_len = sum(1 for _ in run)
+                stdscr.addstr(row_y, col, GLYPHS[cell_color] * run_len, COLOR_ATTR[cell_color])
+                col += run_len * BLOCK_SIZE
+            stdscr.addstr(row_y, offset_x + FIELD_WIDTH - 1, "#")
         
-        # Draw current piece
-        for r in range(len(shape)):
-            for c in range(len(shape[0])):
-                if shape[r][c] and y+r >= 0 and y+r < HEIGHT:
-                    stdscr.addstr(offset_y + y + r + 1, offset_x + (x + c) * BLOCK_SIZE + 1, "[]", curses.color_pair(color))
+        draw.prev_cells = cells
+        draw.prev_origin = (offset_x, offset_y)
         
         # Draw bottom border
-        stdscr.addstr(offset_y + HEIGHT + 1, offset_x, top_border)
+        stdscr.addstr(offset_y + HEIGHT + 1, offset_x, TOP_BORDER)
         
         # Draw preview boxes
-        preview_col = offset_x + field_width + 2
-        draw_preview(stdscr, held_shape, offset_y, preview_col, "HOLD (C)")
-        draw_preview(stdscr, next_shape, offset_y + 8, preview_col, "NEXT")
+        preview_col = offset_x + FIELD_WIDTH + 2
+        draw_preview(stdscr, held_piece, offset_y, preview_col, "HOLD (C)")
+        draw_preview(stdscr, next_piece, offset_y + 8, preview_col, "NEXT")
         
         # Draw info below the game
         info_y = offset_y + HEIGHT + 3
         stdscr.addstr(info_y, offset_x, f"Player: {PLAYER}               ")
         
-        if garbage_pending > 0:
-            stdscr.addstr(info_y + 1, offset_x, f"Garbage incoming: {garbage_pending}    ")
-        else:
-            stdscr.addstr(info_y + 1, offset_x, " " * 30)
-        
         if last_rotation_was_tspin:
-            stdscr.addstr(info_y + 2, offset_x, "T-SPIN!                    ", curses.A_BOLD | curses.color_pair(3))
+            stdscr.addstr(info_y + 2, offset_x, "T-SPIN!                    ", curses.A_BOLD | COLOR_ATTR[3])
         else:
             stdscr.addstr(info_y + 2, offset_x, " " * 30)
         
@@ -307,11 +474,23 @@ def draw(stdscr, board, shape, x, y, garbage_pending, next_shape, held_shape, ca
     
     stdscr.refresh()
 
+draw.prev_cells = None
+draw.prev_origin = None
+draw.screen_size = None
+draw.offsets = (0, 0)
+
 def main(stdscr):
-    global pending_garbage, last_read_time, last_clear_was_line
+    global pending_garbage, last_read_time, last_clear_was_line, COLOR_ATTR
     
     curses.curs_set(0)
-    stdscr.nodelay(True)
+    
+    # Initialize colors once, before anything is drawn
+    curses.start_color()
+    foregrounds = (curses.COLOR_CYAN, curses.COLOR_YELLOW, curses.COLOR_MAGENTA, curses.COLOR_GREEN,
+                   curses.COLOR_RED, curses.COLOR_BLUE, curses.COLOR_YELLOW, curses.COLOR_WHITE)
+    for i, fg in enumerate(foregrounds, start=1):
+        curses.init_pair(i, fg, curses.COLOR_BLACK)
+    COLOR_ATTR = tuple(curses.color_pair(i) for i in range(9))
     
     # 3-second countdown
     for i in range(3, 0, -1):
@@ -320,85 +499,113 @@ def main(stdscr):
     draw_countdown(stdscr, 0)
     time.sleep(0.5)
     
-    board = new_board()
+    board, board_bits, col_heights = new_board()
     
     # Generate piece bag
-    piece_names = list(TETROMINOES.keys())
-    random.shuffle(piece_names)
-    piece_bag = [TETROMINOES[name] for name in piece_names]
+    piece_bag = refill_bag([])
     
-    shape = piece_bag.pop(0)
-    next_shape = piece_bag[0] if piece_bag else random.choice(list(TETROMINOES.values()))
-    held_shape = None
+    piece = piece_bag.pop(0)
+    rot_idx = 0
+    shape = PIECE_ROTATIONS[piece][rot_idx]
+    next_piece = piece_bag[0]
+    held_piece = None
     can_hold = True
     last_rotation_was_tspin = False
     
-    current_color = COLORS[get_piece_name(shape)]
+    current_color = PIECE_COLORS[piece]
     
-    x = WIDTH//2 - len(shape[0])//2
+    x = WIDTH//2 - shape_width(shape)//2
     y = -1
     
-    last_tick = time.time()
+    last_tick = time.monotonic_ns()
     soft_drop_active = False
     last_rotation_time = 0
     
+    tick_fd = open_tick_timer(TICK_NS)
+    watch_fd = open_dir_watch(SHARED_DIR)
+    watched = [sys.stdin] + [fd for fd in (tick_fd, watch_fd) if fd is not None]
+    stdscr.nodelay(True)
+    key = -1
+    
     while True:
-        current_time = time.time()
+        # Sleep in select until a key, a tick, a new shared file or the next garbage check.
+        # Right after a key, curses may hold more buffered input, so only poll.
+        if key != -1:
+            wait = 0
+        else:
+            next_deadline = last_read_time + READ_INTERVAL_NS
+            if tick_fd is None:
+                next_deadline = min(next_deadline, last_tick + TICK_NS)
+            wait = max(0, next_deadline - time.monotonic_ns()) / 1e9
+        ready = select.select(watched, [], [], wait)[0]
         
         # Handle input
         key = stdscr.getch()
+        current_time = time.monotonic_ns()
         soft_drop_active = False
         
         if key == ord('q'):
             signal_dead()
             break
-        if key == ord('a') and not collide(board, shape, x-1, y):
+        if key == ord('a') and not collide(board_bits, shape, x-1, y):
             x -= 1
-        if key == ord('d') and not collide(board, shape, x+1, y):
+        if key == ord('d') and not collide(board_bits, shape, x+1, y):
             x += 1
         if key == ord('w'):
-            r = rotate(shape)
-            if not collide(board, r, x, y):
-                shape = r
+            rotations = PIECE_ROTATIONS[piece]
+            new_rot = (rot_idx + 1) % len(rotations)
+            if not collide(board_bits, rotations[new_rot], x, y):
+                rot_idx = new_rot
+                shape = rotations[new_rot]
                 last_rotation_time = current_time
         if key == ord('s'):
             soft_drop_active = True
         if key == ord(' '):
-            while not collide(board, shape, x, y+1):
-                y += 1
+            y = hard_drop_y(board_bits, col_heights, shape, x, y)
         if key == ord('c') and can_hold:
-            if held_shape is None:
-                held_shape = shape
+            if held_piece is None:
+                held_piece = piece
+                piece = piece_bag.pop(0)
                 if not piece_bag:
-                    piece_names = list(TETROMINOES.keys())
-                    random.shuffle(piece_names)
-                    piece_bag = [TETROMINOES[name] for name in piece_names]
-                shape = piece_bag.pop(0)
-                next_shape = piece_bag[0] if piece_bag else random.choice(list(TETROMINOES.values()))
+                    refill_bag(piece_bag)
+                next_piece = piece_bag[0]
             else:
-                shape, held_shape = held_shape, shape
+                piece, held_piece = held_piece, piece
             
-            current_color = COLORS[get_piece_name(shape)]
-            x = WIDTH//2 - len(shape[0])//2
+            rot_idx = 0
+            shape = PIECE_ROTATIONS[piece][rot_idx]
+            current_color = PIECE_COLORS[piece]
+            x = WIDTH//2 - shape_width(shape)//2
             y = -1
             can_hold = False
             last_rotation_was_tspin = False
         
-        # Game tick
-        tick_speed = TICK / 10 if soft_drop_active else TICK
+        # Game ticks: every timer expiry since the last pass is applied
+        if tick_fd is not None:
+            ticks = tick_expirations(tick_fd)
+        else:
+            ticks = 1 if current_time - last_tick >= TICK_NS else 0
+        
+        # Soft drop ticks ten times faster, then gravity restarts from this step
+        if soft_drop_active and not ticks and current_time - last_tick >= TICK_NS // 10:
+            ticks = 1
+            if tick_fd is not None:
+                set_tick_interval(tick_fd, TICK_NS)
         
-        if current_time - last_tick >= tick_speed:
+        if ticks:
             last_tick = current_time
-            
-            if not collide(board, shape, x, y+1):
+        
+        game_over = False
+        for _ in range(ticks):
+            if not collide(board_bits, shape, x, y+1):
                 y += 1
             else:
                 # Check if last rotation was recent (T-spin detection)
-                is_tspin = (current_time - last_rotation_time < 0.5) and check_tspin(board, shape, x, y, get_piece_name(shape))
+                is_tspin = (current_time - last_rotation_time < TSPIN_WINDOW_NS) and check_tspin(board_bits, x, y, PIECE_NAMES[piece])
                 last_rotation_was_tspin = is_tspin
                 
-                lock(board, shape, x, y, current_color)
-                board, cleared = clear_lines(board)
+                lock(board, board_bits, col_heights, shape, x, y, current_color)
+                board, board_bits, cleared = clear_lines(board, board_bits, col_heights)
                 
                 # Calculate and send garbage
                 garbage_to_send = calculate_garbage(cleared, is_tspin, last_clear_was_line)
@@ -409,37 +616,40 @@ def main(stdscr):
                 last_clear_was_line = (cleared > 0)
                 
                 # Get next piece
+                piece = piece_bag.pop(0)
                 if not piece_bag:
-                    piece_names = list(TETROMINOES.keys())
-                    random.shuffle(piece_names)
-                    piece_bag = [TETROMINOES[name] for name in piece_names]
-                
-                shape = piece_bag.pop(0)
-                next_shape = piece_bag[0] if piece_bag else random.choice(list(TETROMINOES.values()))
-                current_color = COLORS[get_piece_name(shape)]
-                x = WIDTH//2 - len(shape[0])//2
+                    refill_bag(piece_bag)
+                rot_idx = 0
+                shape = PIECE_ROTATIONS[piece][rot_idx]
+                next_piece = piece_bag[0]
+                current_color = PIECE_COLORS[piece]
+                x = WIDTH//2 - shape_width(shape)//2
                 y = -1
                 can_hold = True
                 
-                if collide(board, shape, x, y+1):
+                if collide(board_bits, shape, x, y+1):
                     signal_dead()
+                    game_over = True
                     break
         
-        # Check for incoming garbage
-        if current_time - last_read_time >= READ_INTERVAL:
+        if game_over:
+            break
+        
+        # Check for incoming garbage every READ_INTERVAL_NS, inotify only makes a local file show up sooner
+        # since it misses files created from other hosts on network mounts
+        dir_changed = watch_fd in ready and drain_events(watch_fd)
+        if dir_changed or current_time - last_read_time >= READ_INTERVAL_NS:
             last_read_time = current_time
             garbage_count = check_garbage()
             if garbage_count > 0:
                 pending_garbage += garbage_count
         
-        # Apply pending garbage
+        # Apply all pending garbage in one shift
         if pending_garbage > 0:
-            add_garbage(board, 1)
-            pending_garbage -= 1
+            add_garbage(board, board_bits, col_heights, pending_garbage)
+            pending_garbage = 0
         
         # Render
-        draw(stdscr, board, shape, x, y, pending_garbage, next_shape, held_shape, can_hold, current_color, last_rotation_was_tspin)
-        
-        time.sleep(0.01)
+        draw(stdscr, board, shape, x, y, next_piece, held_piece, can_hold, current_color, last_rotation_was_tspin)
 
 curses.wrapper(main)
\ No newline at end of file
@@ -4,6 +4,8 @@ import sys
 import os
 import random
 from collections import deque
+from array import array
+from itertools import groupby
 import uuid
 
 # ---------------- CONFIG ----------------
@@ -21,11 +23,20 @@ if len(sys.argv) < 2:
     sys.exit(1)
 
 PLAYER = sys.argv[1]
+# Each player publishes the running total of garbage it sent in garbage_{PLAYER}_total.txt
+GARBAGE_PREFIX = "garbage_"
+GARBAGE_SUFFIX = "_total.txt"
+OWN_GARBAGE_FILE = f"{GARBAGE_PREFIX}{PLAYER}{GARBAGE_SUFFIX}"
 os.makedirs(SHARED_DIR, exist_ok=True)
 
 last_read_time = 0
 pending_garbage = 0
 last_clear_was_line = False  # Track if previous drop cleared a line
+last_dir_mtime = None  # SHARED_DIR mtime at the last garbage scan
+last_dir_mtime_since = 0  # When that mtime was first seen, by our own clock
+leaderboard_cache = None  # Leaderboard entries, parsed from LEADERBOARD_FILE on first use
+garbage_sent = 0  # Our running total, as published in OWN_GARBAGE_FILE
+garbage_seen = {}  # Last total read from each opponent's file
 
 TETROMINOES = {
     "I": [[1,1,1,1]],
@@ -40,56 +51,118 @@ TETROMINOES = {
 COLORS = {
     "I": 1, "O": 2, "T": 3, "S": 4, "Z": 5, "J": 6, "L": 7, "garbage": 8
 }
+GHOST = 9  # Cell code of the ghost piece, drawn with pair 9 dimmed
+
+# Cell text indexed by cell code, 0 being an empty cell
+GLYPHS = ["  "] + ["[]"] * 9
+
+# curses attribute per cell code, filled in by main once the color pairs exist
+CELL_ATTRS = ()
+
+FULL_MASK = (1 << WIDTH) - 1  # A row with every column filled
+WALLS = ~FULL_MASK  # OR-ed into a row, every column right of the board reads as filled
+
+# Garbage rows indexed by hole column, as row masks and as color bytes
+GARBAGE_BITS = tuple(FULL_MASK ^ (1 << hole) for hole in range(WIDTH))
+GARBAGE_ROWS = tuple(bytes(0 if c == hole else COLORS["garbage"] for c in range(WIDTH)) for hole in range(WIDTH))
+
+# Indexed by a 4-bit corner mask: True when at least 3 corners are filled
+TSPIN_CORNERS = tuple(bin(corners).count("1") >= 3 for corners in range(16))
+
+def row_masks(shape):
+    """Pack each shape row into an int, bit c set when column c is filled"""
+    return tuple(sum(1 << c for c, filled in enumerate(row) if filled) for row in shape)
+
+def shape_width(shape):
+    return max(mask.bit_length() for mask in shape)
 
 def rotate(shape):
-    return [list(row) for row in zip(*shape[::-1])]
+    width = shape_width(shape)
+    grid = [[mask >> c & 1 for c in range(width)] for mask in shape]
+    return row_masks(zip(*grid[::-1]))
+
+def unique_rotations(shape):
+    """Return the distinct clockwise rotations of a shape, starting with the shape itself"""
+    rotations = [shape]
+    while True:
+        r = rotate(rotations[-1])
+        if r == shape:
+            return rotations
+        rotations.append(r)
+
+PIECE_NAMES = tuple(TETROMINOES)
+
+# Pieces as row bitmasks in spawn orientation
+PIECE_MASKS = {name: row_masks(shape) for name, shape in TETROMINOES.items()}
+
+# Every distinct rotation is built once here; rotating in game just steps an index
+ROTATIONS = {name: unique_rotations(shape) for name, shape in PIECE_MASKS.items()}
+
+def column_bottoms(shape):
+    """Lowest filled row of each shape column"""
+    return tuple(max(r for r, mask in enumerate(shape) if mask >> c & 1) for c in range(shape_width(shape)))
+
+# Per rotation, the lowest cell of each column, for the column-top landing calculation
+COLUMN_BOTTOMS = {shape: column_bottoms(shape) for rotations in ROTATIONS.values() for shape in rotations}
+
+# Filled columns of every possible piece row mask (pieces are at most 4 wide),
+# so per-cell loops walk a ready tuple instead of testing bits
+MASK_COLUMNS = tuple(tuple(c for c in range(4) if mask >> c & 1) for mask in range(1 << 4))
 
 def new_board():
-    return [[0]*WIDTH for _ in range(HEIGHT)]
-
-def collide(board, shape, x, y):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c]:
-                nx, ny = x+c, y+r
-                if nx < 0 or nx >= WIDTH or ny >= HEIGHT:
-                    return True
-                if ny >= 0 and board[ny][nx]:
-                    return True
+    """Return the cell colors (for drawing), one bitmask per row (for collisions) and the column tops"""
+    # Collisions only touch the packed 16-bit row masks; the flat color bytes (row-major) are only for drawing
+    return bytearray(HEIGHT * WIDTH), array('H', [0]) * HEIGHT, [HEIGHT] * WIDTH
+
+def column_tops(board_bits):
+    """Smallest filled y of each column, HEIGHT when the column is empty"""
+    return [next((r for r in range(HEIGHT) if board_bits[r] >> c & 1), HEIGHT) for c in range(WIDTH)]
+
+def collide(board_bits, shape, x, y):
+    if x < 0:
+        return True  # Shapes start at bit 0, so any negative x is through the left wall
+    for r, mask in enumerate(shape):
+        row_bits = mask << x
+        if y + r >= HEIGHT or row_bits > FULL_MASK:
+            return True
+        if y + r >= 0 and board_bits[y + r] & row_bits:
+            return True
     return False
 
-def lock(board, shape, x, y, color):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c] and y+r >= 0:
-                board[y+r][x+c] = color
+def lock(board, board_bits, col_top, shape, x, y, color):
+    for r, mask in enumerate(shape):
+        if y + r >= 0:
+            board_bits[y + r] |= mask << x
+            row_start = (y + r) * WIDTH + x
+            for c in MASK_COLUMNS[mask]:
+                board[row_start + c] = color
+                col_top[x + c] = min(col_top[x + c], y + r)
 
-def check_tspin(board, shape, x, y, piece_name):
+def check_tspin(board_bits, shape, x, y, piece_name):
     """Check if the last rotation was a T-spin"""
     if piece_name != "T":
         return False
     
-    # Check corners around the T piece center
-    corners_filled = 0
-    center_x, center_y = x + 1, y + 1  # T piece center
-    
-    # Check all 4 corners
-    corner_positions = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
-    for dx, dy in corner_positions:
-        check_x, check_y = center_x + dx, center_y + dy
-        if check_x < 0 or check_x >= WIDTH or check_y < 0 or check_y >= HEIGHT:
-            corners_filled += 1
-        elif board[check_y][check_x]:
-            corners_filled += 1
+    # Corner rows of the T's 3x3 box; off-board rows and columns count as filled
+    top = board_bits[y] | WALLS if 0 <= y < HEIGHT else -1
+    bottom = board_bits[y + 2] | WALLS if 0 <= y + 2 < HEIGHT else -1
     
-    return corners_filled >= 3
+    # Pack the 4 corners into bits 0-3 and look the answer up
+    corners = (top >> x & 1) | (top >> (x + 1) & 2) | (bottom >> x & 1) << 2 | (bottom >> (x + 1) & 2) << 2
+    return TSPIN_CORNERS[corners]
 
-def clear_lines(board):
-    new = [row for row in board if not all(row)]
-    cleared = HEIGHT - len(new)
-    while len(new) < HEIGHT:
-        new.insert(0, [0]*WIDTH)
-    return new, cleared
+def clear_lines(board, board_bits, col_top, y, rows):
+    """Clear full rows; only the rows y to y+rows-1 the piece just locked into can have filled up"""
+    full_rows = [r for r in range(max(y, 0), min(y + rows, HEIGHT)) if board_bits[r] == FULL_MASK]
+    if full_rows:
+        # Bottom-up so the indices still to delete stay valid; both arrays shift together
+        for r in reversed(full_rows):
+            del board[r * WIDTH:(r + 1) * WIDTH]
+            del board_bits[r]
+        board[:0] = bytes(len(full_rows) * WIDTH)
+        board_bits[:0] = array('H', [0]) * len(full_rows)
+        col_top[:] = column_tops(board_bits)
+    return board, board_bits, len(full_rows)
 
 def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     """Calculate garbage lines to send based on Tetris rules"""
@@ -117,56 +190,71 @@ def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     
     return 0
 
-def add_garbage(board, n):
+def add_garbage(board, board_bits, col_top, n):
     """Add garbage lines with one random hole"""
     for _ in range(n):
-        board.pop(0)
+        del board[:WIDTH]
+        del board_bits[0]
         hole_pos = random.randint(0, WIDTH - 1)
-        garbage_line = [8 if i != hole_pos else 0 for i in range(WIDTH)]
-        board.append(garbage_line)
+        board += GARBAGE_ROWS[hole_pos]
+        board_bits.append(GARBAGE_BITS[hole_pos])
+    col_top[:] = column_tops(board_bits)
+
+def create_signal_file(path):
+    """Create an empty file with a bare open/close syscall pair, no Python file object"""
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+
+def publish_garbage_total():
+    """Write our running garbage total; the rename swaps it in atomically for readers"""
+    try:
+        tmp_path = f"{SHARED_DIR}/.{OWN_GARBAGE_FILE}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(fd, str(garbage_sent).encode())
+        os.close(fd)
+        os.replace(tmp_path, f"{SHARED_DIR}/{OWN_GARBAGE_FILE}")
+    except:
+        pass
 
 def send_garbage(amount):
-    """Send garbage to all opponents by creating files with line count in name"""
+    """Send garbage to all opponents by raising our published total"""
+    global garbage_sent
     if amount <= 0:
         return
     
-    try:
-        # Create a unique file with the amount and sender in the name
-        unique_id = str(uuid.uuid4())[:8]
-        filename = f"garbage_{PLAYER}_{amount}_lines_{unique_id}.txt"
-        filepath = f"{SHARED_DIR}/{filename}"
-        open(filepath, "w").close()
-    except:
-        pass
+    garbage_sent += amount
+    publish_garbage_total()
 
 def check_garbage():
-    """Check for garbage files, sum them up, and remove them"""
+    """Sum up the garbage opponents sent since the last check, from the growth of their totals"""
+    global last_dir_mtime, last_dir_mtime_since
     garbage_count = 0
     try:
-        files = os.listdir(SHARED_DIR)
-        for fname in files:
-            if fname.startswith("garbage_") and fname.endswith(".txt"):
-                # Extract the sender and number of lines from the filename
-                # Format: garbage_{PLAYER}_{amount}_lines_{unique_id}.txt
-                try:
-                    parts = fname.split("_")
-                    sender = parts[1]
-                    
-                    # Skip garbage sent by ourselves
-                    if sender == PLAYER:
-                        continue
-                    
-                    lines = int(parts[2])
-                    garbage_count += lines
-                    
-                    # Remove the file
-                    os.remove(f"{SHARED_DIR}/{fname}")
-                except:
-                    # If we can't parse it, try to remove it anyway
-                    try:
-                        os.remove(f"{SHARED_DIR}/{fname}")
-                    except:
-                        pass
+        # Creating, replacing or removing a file bumps the directory mtime, so an unchanged one means nothing new.
+        # Timestamps can be coarse, so it must stay unchanged for a second by our own clock (the server's may differ).
+        dir_mtime = os.stat(SHARED_DIR).st_mtime_ns
+        now = time.time_ns()
+        if dir_mtime != last_dir_mtime:
+            last_dir_mtime, last_dir_mtime_since = dir_mtime, now
+        elif now - last_dir_mtime_since > 1_000_000_000:
+            return 0
+        
+        for entry in os.scandir(SHARED_DIR):
+            fname = entry.name
+            if fname == OWN_GARBAGE_FILE or not (fname.startswith(GARBAGE_PREFIX) and fname.endswith(GARBAGE_SUFFIX)):
+                continue
+            
+            # Format: garbage_{PLAYER}_total.txt holding one integer
+            sender = fname[len(GARBAGE_PREFIX):-len(GARBAGE_SUFFIX)]
+            try:
+                with open(entry.path) as f:
+                    total = int(f.read())
+            except:
+                continue
+            
+            # A total lower than last time means that player restarted and counts from 0 again
+            last = garbage_seen.get(sender, 0)
+            garbage_count += total - last if total >= last else total
+            garbage_seen[sender] = total
     except:
         pass
     return garbage_count
@@ -175,14 +263,18 @@ def signal_dead():
     """Signal that player is dead"""
     try:
         dead_file = f"{SHARED_DIR}/dead_{PLAYER}_{uuid.uuid4().hex[:8]}.txt"
-        open(dead_file, "w").close()
+        create_signal_file(dead_file)
     except:
         pass
 
 # ============= LEADERBOARD FUNCTIONS =============
 
 def load_leaderboard():
-    """Load leaderboard from file"""
+    """Load leaderboard from file, only reading it the first time"""
+    global leaderboard_cache
+    if leaderboard_cache is not None:
+        return leaderboard_cache
+    
     leaderboard = []
     try:
         if os.path.exists(LEADERBOARD_FILE):
@@ -202,19 +294,22 @@ def load_leaderboard():
                             })
     except:
         pass
+    leaderboard_cache = leaderboard
     return leaderboard
 
 def save_leaderboard(leaderboard):
     """Save leaderboard to file"""
     try:
-        with open(LEADERBOARD_FILE, "w") as f:
-            for entry in leaderboard:
-                f.write(f"{entry['name']}|{entry['lines']}|{entry['date']}\n")
+        # Write a temp file and rename it over the old one, so a crash never leaves it half written
+        tmp_file = LEADERBOARD_FILE + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.write("".join(f"{entry['name']}|{entry['lines']}|{entry['date']}\n" for entry in leaderboard))
+        os.replace(tmp_file, LEADERBOARD_FILE)
     except:
         pass
 
 def add_to_leaderboard(name, lines_cleared):
-    """Add a new entry to the leaderboard"""
+    """Add a new entry to the cached leaderboard and save it"""
     from datetime import datetime
     
     leaderboard = load_leaderboard()
@@ -230,7 +325,7 @@ def add_to_leaderboard(name, lines_cleared):
     leaderboard.sort(key=lambda x: x["lines"], reverse=True)
     
     # Keep top 10
-    leaderboard = leaderboard[:10]
+    del leaderboard[10:]
     
     save_leaderboard(leaderboard)
     return leaderboard
@@ -275,11 +370,15 @@ def display_leaderboard(stdscr, player_lines):
 
 # ============= GHOST PIECE FUNCTIONS =============
 
-def get_ghost_y(board, shape, x, y):
+def get_ghost_y(board_bits, col_top, shape, x, y):
     """Calculate the Y position where the piece would land"""
-    ghost_y = y
-    while not collide(board, shape, x, ghost_y + 1):
-        ghost_y += 1
+    # Each column lets the piece fall until its lowest cell sits on that column's top
+    ghost_y = min(col_top[x + c] - bottom for c, bottom in enumerate(COLUMN_BOTTOMS[shape])) - 1
+    if ghost_y < y:
+        # Part of the piece is already below a column top (tucked under an overhang), so step down instead
+        ghost_y = y
+        while not collide(board_bits, shape, x, ghost_y + 1):
+            ghost_y += 1
     return ghost_y
 
 def draw_preview(stdscr, shape, piece_name, row_offset, col_offset, title):
@@ -299,11 +398,10 @@ def draw_preview(stdscr, shape, piece_name, row_offset, col_offset, title):
         if shape and piece_name:
             color = COLORS.get(piece_name, 7)
             y_offset = 2 + (4 - len(shape)) // 2
-            x_offset = col_offset + 1 + (box_width - len(shape[0]) * BLOCK_SIZE) // 2
-            for r in range(len(shape)):
-                for c in range(len(shape[0])):
-                    if shape[r][c]:
-                        stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", curses.color_pair(color))
+            x_offset = col_offset + 1 + (box_width - shape_width(shape) * BLOCK_SIZE) // 2
+            for r, mask in enumerate(shape):
+                for c in MASK_COLUMNS[mask]:
+                    stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", CELL_ATTRS[color])
     except curses.error:
         pass
 
@@ -322,10 +420,11 @@ def draw_countdown(stdscr, count):
     except curses.error:
         pass
 
-def draw(stdscr, board, shape, piece_name, x, y, garbage_pending, next_shape, next_piece_name, 
+def draw(stdscr, board, board_bits, col_top, shape, piece_name, x, y, garbage_pending, next_shape, next_piece_name, 
          held_shape, held_piece_name, can_hold, color, last_rotation_was_tspin, total_lines):
     """Draw the game state centered on screen"""
     max_y, max_x = stdscr.getmaxyx()
+    addstr = stdscr.addstr
     
     # Calculate game field dimensions
     field_width = WIDTH * BLOCK_SIZE + 2  # +2 for borders
@@ -338,7 +437,7 @@ def draw(stdscr, board, shape, piece_name, x, y, garbage_pending, next_shape, ne
     offset_y = max((max_y - field_height - 5) // 2, 0)
     
     # Calculate ghost position
-    ghost_y = get_ghost_y(board, shape, x, y)
+    ghost_y = get_ghost_y(board_bits, col_top, shape, x, y)
     
     try:
         # Initialize colors if not done
@@ -356,85 +455,89 @@ def draw(stdscr, board, shape, piece_name, x, y, garbage_pending, next_shape, ne
             curses.init_pair(9, curses.COLOR_WHITE, -1)  # Ghost piece color (dim)
             draw.colors_initialized = True
         
-        stdscr.clear()
+        # Repaint everything only on the first frame or after a resize
+        if (max_y, max_x) != draw.screen_size:
+            stdscr.clear()
+            draw.prev_cells = None
+            draw.screen_size = (max_y, max_x)
         
-        # Draw top border
-        top_border = "#" * field_width
-        stdscr.addstr(offset_y, offset_x, top_border)
+        # Rows equal to the last drawn frame are skipped; an interrupted frame repaints all
+        prev_cells = draw.prev_cells
+        draw.prev_cells = None
         
-        # Draw board with side walls
+        # Draw top and bottom borders
+        if prev_cells is None:
+            top_border = "#" * field_width
+            addstr(offset_y, offset_x, top_border)
+            addstr(offset_y + HEIGHT + 1, offset_x, top_border)
+        
+        # Compose the field: board colors, then the ghost, then the current piece on top
+        cells = [board[r * WIDTH:(r + 1) * WIDTH] for r in range(HEIGHT)]
+        overlays = [(y, color)] if ghost_y == y else [(ghost_y, GHOST), (y, color)]
+        for top, code in overlays:
+            for pr, mask in enumerate(shape):
+                if 0 <= top + pr < HEIGHT:
+                    row = cells[top + pr]
+                    for pc in MASK_COLUMNS[mask]:
+                        row[x + pc] = code
+        
+        # Draw board with side walls, one addstr per run of same-looking cells
         for r in range(HEIGHT):
-            stdscr.addstr(offset_y + r + 1, offset_x, "#")
-            for c in range(WIDTH):
-                cell_drawn = False
-                
-                # Check if current piece is here
-                for pr in range(len(shape)):
-                    for pc in range(len(shape[0])):
-                        if shape[pr][pc]:
-                            if r == y + pr and c == x + pc:
-                                stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(color))
-                                cell_drawn = True
-                                break
-                    if cell_drawn:
-                        break
-                
-                # Check if ghost piece is here (only if not current piece)
-                if not cell_drawn and ghost_y != y:
-                    for pr in range(len(shape)):
-                        for pc in range(len(shape[0])):
-                            if shape[pr][pc]:
-                                if r == ghost_y + pr and c == x + pc:
-                                    stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(9) | curses.A_DIM)
-                                    cell_drawn = True
-                                    break
-                        if cell_drawn:
-                            break
-                
-                # Draw board cell
-                if not cell_drawn:
-                    if board[r][c]:
-                        cell_color = board[r][c]
-                        stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(cell_color))
-                    else:
-                        stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "  ")
-                
-            stdscr.addstr(offset_y + r + 1, offset_x + field_width - 1, "#")
+            if prev_cells and cells[r] == prev_cells[r]:
+                continue
+            row_y = offset_y + r + 1
+            addstr(row_y, offset_x, "#")
+            col = offset_x + 1
+            for code, run in groupby(cells[r]):
+                run_len = sum(1 for _ in run)
+                addstr(row_y, col, GLYPHS[code] * run_len, CELL_ATTRS[code])
+                col += run_len * BLOCK_SIZE
+            addstr(row_y, offset_x + field_width - 1, "#")
         
-        # Draw bottom border
-        stdscr.addstr(offset_y + HEIGHT + 1, offset_x, top_border)
+        draw.prev_cells = cells
         
-        # Draw preview boxes
+        # Draw preview boxes, only on a repaint or when hold/spawn changed their piece
         preview_col = offset_x + field_width + 2
-        draw_preview(stdscr, held_shape, held_piece_name, offset_y, preview_col, "HOLD (C)")
-        draw_preview(stdscr, next_shape, next_piece_name, offset_y + 8, preview_col, "NEXT")
+        if prev_cells is None or held_piece_name != draw.prev_held:
+            draw_preview(stdscr, held_shape, held_piece_name, offset_y, preview_col, "HOLD (C)")
+            draw.prev_held = held_piece_name
+        if prev_cells is None or next_piece_name != draw.prev_next:
+            draw_preview(stdscr, next_shape, next_piece_name, offset_y + 8, preview_col, "NEXT")
+            draw.prev_next = next_piece_name
         
         # Draw info below the game
         info_y = offset_y + HEIGHT + 3
-        stdscr.addstr(info_y, offset_x, f"Player: {PLAYER}    Lines: {total_lines}         ")
+        addstr(info_y, offset_x, f"Player: {PLAYER}    Lines: {total_lines}         ")
         
         if garbage_pending > 0:
-            stdscr.addstr(info_y + 1, offset_x, f"Garbage incoming: {garbage_pending}    ")
+            addstr(info_y + 1, offset_x, f"Garbage incoming: {garbage_pending}    ")
         else:
-            stdscr.addstr(info_y + 1, offset_x, " " * 30)
+            addstr(info_y + 1, offset_x, " " * 30)
         
         if last_rotation_was_tspin:
-            stdscr.addstr(info_y + 2, offset_x, "T-SPIN!                    ", curses.A_BOLD | curses.color_pair(3))
+            addstr(info_y + 2, offset_x, "T-SPIN!                    ", curses.A_BOLD | CELL_ATTRS[3])
         else:
-            stdscr.addstr(info_y + 2, offset_x, " " * 30)
+            addstr(info_y + 2, offset_x, " " * 30)
         
         controls = "A/D=Move W=Rotate S=Soft SPACE=Hard "
         controls += "C=Hold(used) " if not can_hold else "C=Hold "
         controls += "Q=Quit"
-        stdscr.addstr(info_y + 3, offset_x, controls)
+        addstr(info_y + 3, offset_x, controls)
+        stdscr.clrtoeol()  # The line gets shorter once hold is available again
         
     except curses.error:
         pass
     
-    stdscr.refresh()
+    stdscr.noutrefresh()
+    curses.doupdate()
+
+draw.prev_cells = None
+draw.screen_size = None
+draw.prev_held = None
+draw.prev_next = None
 
 def main(stdscr):
-    global pending_garbage, last_read_time, last_clear_was_line
+    global pending_garbage, last_read_time, last_clear_was_line, CELL_ATTRS
     
     curses.curs_set(0)
     stdscr.nodelay(True)
@@ -451,6 +554,11 @@ def main(stdscr):
     curses.init_pair(7, curses.COLOR_YELLOW, -1)
     curses.init_pair(8, curses.COLOR_WHITE, -1)
     curses.init_pair(9, curses.COLOR_WHITE, -1)
+    CELL_ATTRS = tuple(curses.color_pair(code) for code in range(GHOST)) + (curses.color_pair(9) | curses.A_DIM,)
+    
+    # Reset our published total and note everyone else's, so garbage from earlier games isn't counted
+    publish_garbage_total()
+    check_garbage()
     
     # 3-second countdown
     for i in range(3, 0, -1):
@@ -459,95 +567,115 @@ def main(stdscr):
     draw_countdown(stdscr, 0)
     time.sleep(0.5)
     
-    board = new_board()
+    board, board_bits, col_top = new_board()
     total_lines = 0
     
-    # Generate piece bag with names
+    # Queue of piece names, topped up with a shuffled 7-bag before it can run dry
+    piece_bag = deque()
     def refill_bag():
-        piece_names = list(TETROMINOES.keys())
+        piece_names = list(PIECE_NAMES)
         random.shuffle(piece_names)
-        return piece_names
+        piece_bag.extend(piece_names)
     
-    piece_bag = refill_bag()
+    refill_bag()
     
     # Get first piece with its name
-    current_piece_name = piece_bag.pop(0)
-    shape = [row[:] for row in TETROMINOES[current_piece_name]]
+    current_piece_name = piece_bag.popleft()
+    shape = PIECE_MASKS[current_piece_name]
     
     # Get next piece
-    if not piece_bag:
-        piece_bag = refill_bag()
     next_piece_name = piece_bag[0]
-    next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+    next_shape = PIECE_MASKS[next_piece_name]
     
     held_shape = None
     held_piece_name = None
     can_hold = True
     last_rotation_was_tspin = False
     
+    rot_idx = 0
     current_color = COLORS[current_piece_name]
     
-    x = WIDTH//2 - len(shape[0])//2
+    x = WIDTH//2 - shape_width(shape)//2
     y = -1
     
     last_tick = time.time()
     soft_drop_active = False
     last_rotation_time = 0
     
+    # Names used every loop pass are bound to locals once, skipping the global/attribute lookups
+    _time = time.time
+    _getch = stdscr.getch
+    _collide = collide
+    _draw = draw
+    quit_key, left_key, right_key, rotate_key, soft_key, hard_key, hold_key = map(ord, "qadws c")
+    
+    dirty = True  # Something changed since the last draw
+    
     while True:
-        current_time = time.time()
+        # Block in getch until a key arrives or the next tick / garbage check is due
+        next_deadline = min(last_tick + TICK, last_read_time + READ_INTERVAL)
+        wait_ms = max(1, int((next_deadline - _time()) * 1000))
+        if pending_garbage > 0:
+            wait_ms = min(wait_ms, 10)  # Pending garbage still rises one row every 10ms
+        stdscr.timeout(wait_ms)
         
         # Handle input
-        key = stdscr.getch()
+        key = _getch()
+        current_time = _time()
         soft_drop_active = False
+        hard_dropped = False
+        if key != -1:
+            dirty = True
         
-        if key == ord('q'):
+        if key == quit_key:
             signal_dead()
             # Add to leaderboard and display
             add_to_leaderboard(PLAYER, total_lines)
             display_leaderboard(stdscr, total_lines)
             break
-        if key == ord('a') and not collide(board, shape, x-1, y):
+        if key == left_key and not _collide(board_bits, shape, x-1, y):
             x -= 1
-        if key == ord('d') and not collide(board, shape, x+1, y):
+        if key == right_key and not _collide(board_bits, shape, x+1, y):
             x += 1
-        if key == ord('w'):
-            r = rotate(shape)
+        if key == rotate_key:
+            rotations = ROTATIONS[current_piece_name]
+            new_rot = (rot_idx + 1) % len(rotations)
+            r = rotations[new_rot]
             # Try wall kicks
             kicks = [0, -1, 1, -2, 2]
             for kick in kicks:
-                if not collide(board, r, x + kick, y):
+                if not _collide(board_bits, r, x + kick, y):
                     shape = r
+                    rot_idx = new_rot
                     x += kick
                     last_rotation_time = current_time
                     break
-        if key == ord('s'):
+        if key == soft_key:
             soft_drop_active = True
-        if key == ord(' '):
-            while not collide(board, shape, x, y+1):
-                y += 1
-        if key == ord('c') and can_hold:
+        if key == hard_key:
+            # Jump straight to the landing row and lock on this pass
+            y = get_ghost_y(board_bits, col_top, shape, x, y)
+            hard_dropped = True
+        if key == hold_key and can_hold:
             if held_shape is None:
-                held_shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                held_shape = PIECE_MASKS[current_piece_name]
                 held_piece_name = current_piece_name
                 
-                # Get next piece
-                if not piece_bag:
-                    piece_bag = refill_bag()
-                current_piece_name = piece_bag.pop(0)
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
-                
-                if not piece_bag:
-                    piece_bag = refill_bag()
+                # Get next piece, keeping one queued behind it
+                if len(piece_bag) < 2:
+                    refill_bag()
+                current_piece_name = piece_bag.popleft()
+                shape = PIECE_MASKS[current_piece_name]
                 next_piece_name = piece_bag[0]
-                next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+                next_shape = PIECE_MASKS[next_piece_name]
             else:
                 # Swap current and held
-                shape, held_shape = [row[:] for row in TETROMINOES[held_piece_name]], [row[:] for row in TETROMINOES[current_piece_name]]
+                shape, held_shape = PIECE_MASKS[held_piece_name], PIECE_MASKS[current_piece_name]
                 current_piece_name, held_piece_name = held_piece_name, current_piece_name
             
+            rot_idx = 0
             current_color = COLORS[current_piece_name]
-            x = WIDTH//2 - len(shape[0])//2
+            x = WIDTH//2 - shape_width(shape)//2
             y = -1
             can_hold = False
             last_rotation_was_tspin = False
@@ -555,18 +683,19 @@ def main(stdscr):
         # Game tick
         tick_speed = TICK / 10 if soft_drop_active else TICK
         
-        if current_time - last_tick >= tick_speed:
+        if hard_dropped or current_time - last_tick >= tick_speed:
             last_tick = current_time
+            dirty = True
             
-            if not collide(board, shape, x, y+1):
+            if not _collide(board_bits, shape, x, y+1):
                 y += 1
             else:
                 # Check if last rotation was recent (T-spin detection)
-                is_tspin = (current_time - last_rotation_time < 0.5) and check_tspin(board, shape, x, y, current_piece_name)
+                is_tspin = (current_time - last_rotation_time < 0.5) and check_tspin(board_bits, shape, x, y, current_piece_name)
                 last_rotation_was_tspin = is_tspin
                 
-                lock(board, shape, x, y, current_color)
-                board, cleared = clear_lines(board)
+                lock(board, board_bits, col_top, shape, x, y, current_color)
+                board, board_bits, cleared = clear_lines(board, board_bits, col_top, y, len(shape))
                 total_lines += cleared
                 
                 # Calculate and send garbage
@@ -577,24 +706,21 @@ def main(stdscr):
                 # Update last clear status
                 last_clear_was_line = (cleared > 0)
                 
-                # Get next piece
-                if not piece_bag:
-                    piece_bag = refill_bag()
-                
-                current_piece_name = piece_bag.pop(0)
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
-                
-                if not piece_bag:
-                    piece_bag = refill_bag()
+                # Get next piece, keeping one queued behind it
+                if len(piece_bag) < 2:
+                    refill_bag()
+                current_piece_name = piece_bag.popleft()
+                shape = PIECE_MASKS[current_piece_name]
                 next_piece_name = piece_bag[0]
-                next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+                next_shape = PIECE_MASKS[next_piece_name]
                 
+                rot_idx = 0
                 current_color = COLORS[current_piece_name]
-                x = WIDTH//2 - len(shape[0])//2
+                x = WIDTH//2 - shape_width(shape)//2
                 y = -1
                 can_hold = True
                 
-                if collide(board, shape, x, y+1):
+                if _collide(board_bits, shape, x, y+1):
                     signal_dead()
                     # Add to leaderboard and display
                     add_to_leaderboard(PLAYER, total_lines)
@@ -610,14 +736,15 @@ def main(stdscr):
         
         # Apply pending garbage
         if pending_garbage > 0:
-            add_garbage(board, 1)
+            add_garbage(board, board_bits, col_top, 1)
             pending_garbage -= 1
+            dirty = True
         
-        # Render
-        draw(stdscr, board, shape, current_piece_name, x, y, pending_garbage, 
-             next_shape, next_piece_name, held_shape, held_piece_name, 
-             can_hold, current_color, last_rotation_was_tspin, total_lines)
-        
-        time.sleep(0.01)
+        # Render, only when something changed
+        if dirty:
+            _draw(stdscr, board, board_bits, col_top, shape, current_piece_name, x, y, pending_garbage, 
+                 next_shape, next_piece_name, held_shape, held_piece_name, 
+                 can_hold, current_color, last_rotation_was_tspin, total_lines)
+            dirty = False
 
 curses.wrapper(main)
\ No newline at end of file
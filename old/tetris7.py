@@ -3,15 +3,21 @@ import time
 import sys
 import os
 import random
+import select
+import struct
+import ctypes
+import ctypes.util
 from collections import deque
-import uuid
+from itertools import count, groupby
 
 # ---------------- CONFIG ----------------
 WIDTH = 10
 HEIGHT = 20
-TICK = 0.25
+TICK_NS = 250_000_000  # 0.25s, timings are integer monotonic_ns
 SHARED_DIR = "/sgoinfre/lusteur/tetris"
-READ_INTERVAL = 0.05
+READ_INTERVAL_NS = 50_000_000
+FRAME_NS = 10_000_000  # Frame time while garbage lines are still rising, one per frame
+TSPIN_WINDOW_NS = 500_000_000  # Rotation this recent makes a lock count as a T-spin
 BLOCK_SIZE = 2
 LEADERBOARD_FILE = "leaderboard.txt"
 # ---------------------------------------
@@ -23,9 +29,20 @@ if len(sys.argv) < 2:
 PLAYER = sys.argv[1]
 os.makedirs(SHARED_DIR, exist_ok=True)
 
-last_read_time = 0
+# Garbage files are named garbage_{sender}_..., so our own are skipped by prefix alone
+OWN_GARBAGE_PREFIX = f"garbage_{PLAYER}_"
+GARBAGE_PATH_PREFIX = f"{SHARED_DIR}/{OWN_GARBAGE_PREFIX}"
+
+# Signal files are told apart by our pid plus a per-process counter
+PID_HEX = f"{os.getpid():x}"
+signal_seq = count()
+
 pending_garbage = 0
 last_clear_was_line = False
+seen_garbage = set()  # Garbage files already counted that we could not remove
+last_dir_mtime = None  # SHARED_DIR mtime at the last garbage scan
+last_dir_mtime_since = 0  # When that mtime was first seen, by our own clock
+compactions = {}  # Full-row mask -> (kept rows mask, shift) runs, see compaction()
 
 TETROMINOES = {
     "I": [[1,1,1,1]],
@@ -37,35 +54,105 @@ TETROMINOES = {
     "L": [[0,0,1],[1,1,1]]
 }
 
+PIECE_NAMES = tuple(TETROMINOES)
+
 COLORS = {
     "I": 1, "O": 2, "T": 3, "S": 4, "Z": 5, "J": 6, "L": 7
 }
 
+FULL_COLUMN = (1 << HEIGHT) - 1  # A column with every row filled, bit r being row r
+
+# Garbage rows indexed by hole column: the colors, and the bottom-row bit each column gains
+GARBAGE_ROWS = tuple(bytes(0 if c == hole else 8 for c in range(WIDTH)) for hole in range(WIDTH))
+GARBAGE_BITS = tuple(tuple((c != hole) << (HEIGHT - 1) for c in range(WIDTH)) for hole in range(WIDTH))
+
+GHOST = 16  # Added to a color code to draw that cell as the ghost
+
+# curses attributes per color code, for blocks and for the dimmed ghost; filled in by main once the color pairs exist
+COLOR_ATTR = ()
+GHOST_ATTR = ()
+
+def column_masks(grid):
+    """Pack each shape column into an int, bit r set when row r is filled"""
+    return tuple(sum(1 << r for r, filled in enumerate(column) if filled) for column in zip(*grid))
+
+def shape_height(shape):
+    return max(mask.bit_length() for mask in shape)
+
 def rotate(shape):
-    """Rotate shape 90 degrees clockwise, returning lists not tuples"""
-    return [list(row) for row in zip(*shape[::-1])]
+    """Rotate shape 90 degrees clockwise"""
+    grid = [[mask >> r & 1 for mask in shape] for r in range(shape_height(shape))]
+    return column_masks(zip(*grid[::-1]))
+
+def unique_rotations(shape):
+    """Return the distinct clockwise rotations of a shape, starting with the shape itself"""
+    rotations = [shape]
+    while True:
+        r = rotate(rotations[-1])
+        if r == shape:
+            return rotations
+        rotations.append(r)
+
+# Pieces as column bitmasks in spawn orientation
+PIECE_MASKS = {name: column_masks(shape) for name, shape in TETROMINOES.items()}
+
+# Every distinct rotation is built once here; rotating in game just steps an index
+ROTATIONS = {name: unique_rotations(shape) for name, shape in PIECE_MASKS.items()}
 
 def new_board():
-    return [[0]*WIDTH for _ in range(HEIGHT)]
-
-def collide(board, shape, x, y):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c]:
-                nx, ny = x+c, y+r
-                if nx < 0 or nx >= WIDTH or ny >= HEIGHT:
-                    return True
-                if ny >= 0 and board[ny][nx]:
-                    return True
+    """Return the cell colors (for drawing), one bitmask per column (for collisions) and the column tops"""
+    # Colors are one flat buffer, cell (r, c) at r*WIDTH + c
+    return bytearray(HEIGHT * WIDTH), [0] * WIDTH, [HEIGHT] * WIDTH
+
+def column_top(col):
+    """Smallest filled row of a column mask (its lowest set bit), HEIGHT when the column is empty"""
+    return (col & -col).bit_length() - 1 if col else HEIGHT
+
+def column_cells(mask, y):
+    """Move a column mask to board row y; cells above the board are dropped"""
+    return mask << y if y >= 0 else mask >> -y
+
+def placements(shape):
+    """Column masks of a shape at every row y from MIN_Y to HEIGHT, None where a cell is below the floor"""
+    placed = []
+    for y in range(MIN_Y, HEIGHT + 1):
+        cells = tuple(column_cells(mask, y) for mask in shape)
+        placed.append(None if any(col >> HEIGHT for col in cells) else cells)
+    return tuple(placed)
+
+def shape_cells(shape):
+    """(row, column) of every filled cell of a shape"""
+    return tuple((r, c) for c, mask in enumerate(shape) for r in range(mask.bit_length()) if mask >> r & 1)
+
+MIN_Y = -4  # Highest a piece can be: fully above the board
+
+# Every rotation already shifted to every row, so collide() and lock() only index and AND
+PLACEMENTS = {shape: placements(shape) for rotations in ROTATIONS.values() for shape in rotations}
+
+# The 4 cells of every rotation, so per-cell loops don't test each bit of the masks
+CELLS = {shape: shape_cells(shape) for rotations in ROTATIONS.values() for shape in rotations}
+
+def collide(board_cols, shape, x, y):
+    if x < 0 or x + len(shape) > WIDTH:
+        return True
+    placed = PLACEMENTS[shape][y - MIN_Y]
+    if placed is None:
+        return True
+    for cells in placed:
+        if board_cols[x] & cells:
+            return True
+        x += 1
     return False
 
-def lock(board, shape, x, y, color):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c] and y+r >= 0:
-                board[y+r][x+c] = color
+def lock(board, board_cols, col_top, shape, x, y, color):
+    for c, cells in enumerate(PLACEMENTS[shape][y - MIN_Y]):
+        board_cols[x + c] |= cells
+        col_top[x + c] = column_top(board_cols[x + c])
+    for r, c in CELLS[shape]:
+        if y + r >= 0:
+            board[(y + r) * WIDTH + x + c] = color
 
-def check_tspin(board, shape, x, y, piece_name):
+def check_tspin(board_cols, shape, x, y, piece_name):
     """Check if the last rotation was a T-spin"""
     if piece_name != "T":
         return False
@@ -78,17 +165,44 @@ def check_tspin(board, shape, x, y, piece_name):
         check_x, check_y = center_x + dx, center_y + dy
         if check_x < 0 or check_x >= WIDTH or check_y < 0 or check_y >= HEIGHT:
             corners_filled += 1
-        elif board[check_y][check_x]:
+        elif board_cols[check_x] >> check_y & 1:
             corners_filled += 1
     
     return corners_filled >= 3
 
-def clear_lines(board):
-    new = [row for row in board if not all(row)]
-    cleared = HEIGHT - len(new)
-    while len(new) < HEIGHT:
-        new.insert(0, [0]*WIDTH)
-    return new, cleared
+def compaction(full):
+    """Group the rows that stay by how far they fall, i.e. the number of full rows below them"""
+    runs = compactions.get(full)
+    if runs is None:
+        masks = {}
+        shift = 0
+        for r in range(HEIGHT - 1, -1, -1):
+            if full >> r & 1:
+                shift += 1
+            else:
+                masks[shift] = masks.get(shift, 0) | 1 << r
+        runs = compactions[full] = tuple((mask, shift) for shift, mask in masks.items())
+    return runs
+
+def clear_lines(board, board_cols, col_top):
+    # A row is full when its bit is set in every column
+    full = FULL_COLUMN
+    for col in board_cols:
+        full &= col
+    if not full:
+        return board, board_cols, 0
+    
+    # Same compaction for every column: each run of kept rows drops by its shift
+    runs = compaction(full)
+    board_cols = [sum((col & mask) << shift for mask, shift in runs) for col in board_cols]
+    col_top[:] = map(column_top, board_cols)
+    
+    # Top-down, so the rows still to remove keep their index
+    full_rows = [r for r in range(HEIGHT) if full >> r & 1]
+    for r in full_rows:
+        del board[r * WIDTH:(r + 1) * WIDTH]
+        board[:0] = bytes(WIDTH)
+    return board, board_cols, len(full_rows)
 
 def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     if lines_cleared == 0:
@@ -113,98 +227,180 @@ def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     
     return 0
 
-def add_garbage(board, n):
+def add_garbage(board, board_cols, col_top, n):
     for _ in range(n):
-        board.pop(0)
-        hole_pos = random.randint(0, WIDTH - 1)
-        garbage_line = [8 if i != hole_pos else 0 for i in range(WIDTH)]
-        board.append(garbage_line)
+        del board[:WIDTH]
+        hole_pos = random.randrange(WIDTH)
+        board += GARBAGE_ROWS[hole_pos]
+        # Every column moves up a row, the garbage fills the bottom one
+        board_cols[:] = [col >> 1 | bit for col, bit in zip(board_cols, GARBAGE_BITS[hole_pos])]
+    col_top[:] = map(column_top, board_cols)
+
+def create_signal_file(path):
+    """Create an empty file with a bare open/close syscall pair, no Python file object"""
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0), 0o644))
 
 def send_garbage(amount):
     if amount <= 0:
         return
     
     try:
-        unique_id = str(uuid.uuid4())[:8]
-        filename = f"garbage_{PLAYER}_{amount}_lines_{unique_id}.txt"
-        filepath = f"{SHARED_DIR}/{filename}"
-        open(filepath, "w").close()
+        filepath = f"{GARBAGE_PATH_PREFIX}{amount}_lines_{PID_HEX}-{next(signal_seq):x}.txt"
+        create_signal_file(filepath)
     except:
         pass
 
+def take_garbage_file(fname, path):
+    """Count and remove one garbage file, 0 if it is not an opponent's garbage file"""
+    if not (fname.startswith("garbage_") and fname.endswith(".txt")) or fname.startswith(OWN_GARBAGE_PREFIX) or fname in seen_garbage:
+        return 0
+    
+    # Format: garbage_{sender}_{amount}_lines_{id}.txt; malformed names count 0 and are removed
+    try:
+        lines = int(fname.split("_", 3)[2])
+    except (IndexError, ValueError):
+        lines = 0
+    
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        # Another reader took it first
+        return 0
+    except OSError:
+        # Someone else's file in a sticky shared dir: count it once and don't count it again
+        seen_garbage.add(fname)
+    return lines
+
 def check_garbage():
+    global last_dir_mtime, last_dir_mtime_since
     garbage_count = 0
     try:
-        files = os.listdir(SHARED_DIR)
-        for fname in files:
-            if fname.startswith("garbage_") and fname.endswith(".txt"):
-                try:
-                    parts = fname.split("_")
-                    sender = parts[1]
-                    
-                    if sender == PLAYER:
-                        continue
-                    
-                    lines = int(parts[2])
-                    garbage_count += lines
-                    
-                    os.remove(f"{SHARED_DIR}/{fname}")
-                except:
-                    try:
-                        os.remove(f"{SHARED_DIR}/{fname}")
-                    except:
-                        pass
+        # Creating or removing a file bumps the directory mtime, so an unchanged one means nothing new.
+        # Timestamps can be coarse, so it must stay unchanged for a second by our own clock (the server's may differ).
+        dir_mtime = os.stat(SHARED_DIR).st_mtime_ns
+        now = time.time_ns()
+        if dir_mtime != last_dir_mtime:
+            last_dir_mtime, last_dir_mtime_since = dir_mtime, now
+        elif now - last_dir_mtime_since > 1_000_000_000:
+            return 0
+        
+        with os.scandir(SHARED_DIR) as entries:
+            for entry in entries:
+                garbage_count += take_garbage_file(entry.name, entry.path)
     except:
         pass
     return garbage_count
 
+# New shared files are reported by inotify, opened through libc since os has no wrapper
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _libc.inotify_init1
+    _libc.inotify_add_watch
+except (OSError, AttributeError):
+    _libc = None  # Not Linux, main() falls back to polling the directory
+
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len, then len bytes of NUL-padded name
+
+def open_dir_watch(path):
+    """Return a non-blocking inotify fd reporting files written or moved into path, or None if unavailable"""
+    if _libc is None:
+        return None
+    fd = _libc.inotify_init1(os.O_NONBLOCK)
+    if fd < 0:
+        return None
+    if _libc.inotify_add_watch(fd, path.encode(), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+def read_new_files(fd):
+    """Return the names of the files reported since the last call"""
+    names = []
+    try:
+        while True:
+            buf = os.read(fd, 4096)
+            if not buf:
+                break
+            pos = 0
+            while pos < len(buf):
+                name_len = INOTIFY_EVENT.unpack_from(buf, pos)[3]
+                pos += INOTIFY_EVENT.size
+                names.append(buf[pos:pos + name_len].rstrip(b"\0").decode(errors="replace"))
+                pos += name_len
+    except BlockingIOError:
+        pass
+    return names
+
 def signal_dead():
     try:
-        dead_file = f"{SHARED_DIR}/dead_{PLAYER}_{uuid.uuid4().hex[:8]}.txt"
-        open(dead_file, "w").close()
+        dead_file = f"{SHARED_DIR}/dead_{PLAYER}_{PID_HEX}-{next(signal_seq):x}.txt"
+        create_signal_file(dead_file)
     except:
         pass
 
 def save_score(player, lines):
-    """Save score to leaderboard file"""
+    """Save score to leaderboard file and return the new top 10, so it needn't be read back"""
     try:
-        scores = []
-        if os.path.exists(LEADERBOARD_FILE):
-            with open(LEADERBOARD_FILE, 'r') as f:
-                for line in f:
-                    parts = line.strip().split(',')
-                    if len(parts) == 2:
-                        scores.append((parts[0], int(parts[1])))
-        
-        scores.append((player, lines))
-        scores.sort(key=lambda x: x[1], reverse=True)
-        scores = scores[:10]
-        
-        with open(LEADERBOARD_FILE, 'w') as f:
-            for name, score in scores:
-                f.write(f"{name},{score}\n")
-    except:
+        scores = read_leaderboard()
+    except (OSError, UnicodeDecodeError):
+        # Rewriting a file we couldn't read would drop every score in it
+        return []
+    scores.append((player, lines))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    scores = scores[:10]
+    
+    try:
+        # Write a temp file and swap it in, so a crash mid-write can't truncate the leaderboard
+        tmp_file = LEADERBOARD_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.writelines(f"{name},{score}\n" for name, score in scores)
+        os.replace(tmp_file, LEADERBOARD_FILE)
+    except OSError:
         pass
+    return scores
 
-def get_leaderboard():
-    """Read and return top 10 scores"""
+def read_leaderboard():
+    """Return every well-formed score in the leaderboard file, [] if there is no file yet"""
     scores = []
     try:
-        if os.path.exists(LEADERBOARD_FILE):
-            with open(LEADERBOARD_FILE, 'r') as f:
-                for line in f:
-                    parts = line.strip().split(',')
-                    if len(parts) == 2:
-                        scores.append((parts[0], int(parts[1])))
-    except:
+        with open(LEADERBOARD_FILE, 'r') as f:
+            for line in f:
+                name, sep, score = line.strip().rpartition(',')
+                if not sep:
+                    continue
+                try:
+                    scores.append((name, int(score)))
+                except ValueError:
+                    # Only the malformed line is dropped
+                    continue
+    except FileNotFoundError:
         pass
-    return scores[:10]
+    return scores
+
+def get_leaderboard():
+    """Read and return top 10 scores"""
+    try:
+        return read_leaderboard()[:10]
+    except (OSError, UnicodeDecodeError):
+        return []
 
-def calculate_ghost_y(board, shape, x, y):
+def calculate_ghost_y(board_cols, col_top, shape, x, y):
     """Calculate where the piece would land"""
-    ghost_y = y
-    while not collide(board, shape, x, ghost_y + 1):
-        ghost_y += 1
+    # Each column lets the piece fall until its lowest cell sits on that column's top
+    ghost_y = min(col_top[x + c] - mask.bit_length() for c, mask in enumerate(shape))
+    if ghost_y >= y:
+        return ghost_y
+    
+    # Part of the piece is already below a column top (tucked under an overhang), so look under it instead
+    ghost_y = HEIGHT
+    for c, mask in enumerate(shape):
+        # First filled cell under this piece column (its lowest set bit), or the floor
+        below = y + mask.bit_length()
+        stack = board_cols[x + c] >> below << below
+        top = (stack & -stack).bit_length() - 1 if stack else HEIGHT
+        ghost_y = min(ghost_y, top - mask.bit_length())
     return ghost_y
 
 def draw_preview(stdscr, shape, row_offset, col_offset, title, piece_name):
@@ -219,12 +415,10 @@ def draw_preview(stdscr, shape, row_offset, col_offset, title, piece_name):
         
         if shape and piece_name:
             color = COLORS.get(piece_name, 7)
-            y_offset = 2 + (4 - len(shape)) // 2
-            x_offset = col_offset + 1 + (box_width - len(shape[0]) * BLOCK_SIZE) // 2
-            for r in range(len(shape)):
-                for c in range(len(shape[0])):
-                    if shape[r][c]:
-                        stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", curses.color_pair(color))
+            y_offset = 2 + (4 - shape_height(shape)) // 2
+            x_offset = col_offset + 1 + (box_width - len(shape) * BLOCK_SIZE) // 2
+            for r, c in CELLS[shape]:
+                stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", COLOR_ATTR[color])
     except curses.error:
         pass
 
@@ -242,7 +436,7 @@ def draw_countdown(stdscr, count):
     except curses.error:
         pass
 
-def draw(stdscr, board, shape, x, y, garbage_pending, next_shape, held_shape, can_hold, color, last_rotation_was_tspin, lines_cleared, piece_name, next_piece_name, held_piece_name):
+def draw(stdscr, board, board_cols, col_top, shape, x, y, garbage_pending, next_shape, held_shape, can_hold, color, last_rotation_was_tspin, lines_cleared, piece_name, next_piece_name, held_piece_name):
     max_y, max_x = stdscr.getmaxyx()
     
     field_width = WIDTH * BLOCK_SIZE + 2
@@ -254,84 +448,96 @@ def draw(stdscr, board, shape, x, y, garbage_pending, next_shape, held_shape, ca
     offset_y = max((max_y - field_height - 6) // 2, 0)
     
     try:
-        if not hasattr(draw, 'colors_initialized'):
-            curses.start_color()
-            curses.init_pair(1, curses.COLOR_CYAN, curses.COLOR_BLACK)
-            curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-            curses.init_pair(3, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
-            curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)
-            curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)
-            curses.init_pair(6, curses.COLOR_BLUE, curses.COLOR_BLACK)
-            curses.init_pair(7, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-            curses.init_pair(8, curses.COLOR_WHITE, curses.COLOR_BLACK)
-            draw.colors_initialized = True
-        
-        # Calculate ghost position
-        ghost_y = calculate_ghost_y(board, shape, x, y)
+        # Repaint everything only on the first frame or after a resize
+        if (max_y, max_x) != draw.screen_size:
+            stdscr.clear()
+            draw.shadow = draw.prev_panel = None
+            draw.screen_size = (max_y, max_x)
         
-        # Draw top border
-        top_border = "#" * field_width
-        stdscr.addstr(offset_y, offset_x, top_border)
+        # Cells and panel equal to the last drawn frame are skipped; an interrupted frame repaints all
+        shadow = draw.shadow
+        prev_panel = draw.prev_panel
+        draw.shadow = draw.prev_panel = None
         
-        # Draw board with side walls
-        for r in range(HEIGHT):
-            stdscr.addstr(offset_y + r + 1, offset_x, "#")
-            for c in range(WIDTH):
-                if board[r][c]:
-                    cell_color = board[r][c]
-                    stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(cell_color))
-                else:
-                    stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "  ")
-            stdscr.addstr(offset_y + r + 1, offset_x + field_width - 1, "#")
+        # Draw the borders and side walls once
+        if shadow is None:
+            top_border = "#" * field_width
+            stdscr.addstr(offset_y, offset_x, top_border)
+            for r in range(HEIGHT):
+                stdscr.addstr(offset_y + r + 1, offset_x, "#")
+                stdscr.addstr(offset_y + r + 1, offset_x + field_width - 1, "#")
+            stdscr.addstr(offset_y + HEIGHT + 1, offset_x, top_border)
+            shadow = bytes([255]) * (HEIGHT * WIDTH)
         
-        # Draw ghost piece (only if it's below current position)
+        # Compose the field: board colors, then the ghost (color + GHOST), then the current piece on top
+        cells = bytearray(board)
+        ghost_y = calculate_ghost_y(board_cols, col_top, shape, x, y)
+        piece_cells = CELLS[shape]
         if ghost_y != y:
-            for r in range(len(shape)):
-                for c in range(len(shape[0])):
-                    if shape[r][c] and ghost_y+r >= 0 and ghost_y+r < HEIGHT:
-                        if not board[ghost_y+r][x+c]:
-                            stdscr.addstr(offset_y + ghost_y + r + 1, offset_x + (x + c) * BLOCK_SIZE + 1, "..", curses.color_pair(color) | curses.A_DIM)
-        
-        # Draw current piece
-        for r in range(len(shape)):
-            for c in range(len(shape[0])):
-                if shape[r][c] and y+r >= 0 and y+r < HEIGHT:
-                    stdscr.addstr(offset_y + y + r + 1, offset_x + (x + c) * BLOCK_SIZE + 1, "[]", curses.color_pair(color))
-        
-        # Draw bottom border
-        stdscr.addstr(offset_y + HEIGHT + 1, offset_x, top_border)
-        
-        # Draw preview boxes
-        preview_col = offset_x + field_width + 2
-        draw_preview(stdscr, held_shape, offset_y, preview_col, "HOLD (C)", held_piece_name)
-        draw_preview(stdscr, next_shape, offset_y + 8, preview_col, "NEXT", next_piece_name)
+            for r, c in piece_cells:
+                if 0 <= ghost_y + r < HEIGHT and not cells[(ghost_y + r) * WIDTH + x + c]:
+                    cells[(ghost_y + r) * WIDTH + x + c] = GHOST + color
+        for r, c in piece_cells:
+            if 0 <= y + r < HEIGHT:
+                cells[(y + r) * WIDTH + x + c] = color
         
-        # Draw info below the game
-        info_y = offset_y + HEIGHT + 3
-        stdscr.addstr(info_y, offset_x, f"Player: {PLAYER}               ")
-        stdscr.addstr(info_y + 1, offset_x, f"Lines: {lines_cleared}               ")
-        
-        if garbage_pending > 0:
-            stdscr.addstr(info_y + 2, offset_x, f"Garbage incoming: {garbage_pending}    ")
-        else:
-            stdscr.addstr(info_y + 2, offset_x, " " * 30)
-        
-        if last_rotation_was_tspin:
-            stdscr.addstr(info_y + 3, offset_x, "T-SPIN!                    ", curses.A_BOLD | curses.color_pair(3))
-        else:
-            stdscr.addstr(info_y + 3, offset_x, " " * 30)
+        # Only rewrite the rows that changed since the last frame, one addstr per run of equal cells
+        for r in range(HEIGHT):
+            row = cells[r * WIDTH:(r + 1) * WIDTH]
+            if row == shadow[r * WIDTH:(r + 1) * WIDTH]:
+                continue
+            col = offset_x + 1
+            for cell, run in groupby(row):
+                run_len = len(list(run))
+                if cell >= GHOST:
+                    stdscr.addstr(offset_y + r + 1, col, ".." * run_len, GHOST_ATTR[cell - GHOST])
+                elif cell:
+                    stdscr.addstr(offset_y + r + 1, col, "[]" * run_len, COLOR_ATTR[cell])
+                else:
+                    stdscr.addstr(offset_y + r + 1, col, "  " * run_len)
+                col += run_len * BLOCK_SIZE
         
-        controls = "A/D=Move W=Rotate S=Soft SPACE=Hard "
-        controls += "C=Hold(used) " if not can_hold else "C=Hold "
-        controls += "Q=Quit"
-        stdscr.addstr(info_y + 4, offset_x, controls)
+        draw.shadow = cells
         
+        # The previews and info only change with the pieces, lines, garbage, T-spin or hold
+        panel = (held_piece_name, next_piece_name, lines_cleared, garbage_pending, last_rotation_was_tspin, can_hold)
+        if panel != prev_panel:
+            # Draw preview boxes
+            preview_col = offset_x + field_width + 2
+            draw_preview(stdscr, held_shape, offset_y, preview_col, "HOLD (C)", held_piece_name)
+            draw_preview(stdscr, next_shape, offset_y + 8, preview_col, "NEXT", next_piece_name)
+            
+            # Draw info below the game
+            info_y = offset_y + HEIGHT + 3
+            stdscr.addstr(info_y, offset_x, f"Player: {PLAYER}               ")
+            stdscr.addstr(info_y + 1, offset_x, f"Lines: {lines_cleared}               ")
+            
+            if garbage_pending > 0:
+                stdscr.addstr(info_y + 2, offset_x, f"Garbage incoming: {garbage_pending}    ")
+            else:
+                stdscr.addstr(info_y + 2, offset_x, " " * 30)
+            
+            if last_rotation_was_tspin:
+                stdscr.addstr(info_y + 3, offset_x, "T-SPIN!                    ", curses.A_BOLD | COLOR_ATTR[3])
+            else:
+                stdscr.addstr(info_y + 3, offset_x, " " * 30)
+            
+            controls = "A/D=Move W=Rotate S=Soft SPACE=Hard "
+            controls += "C=Hold(used) " if not can_hold else "C=Hold "
+            controls += "Q=Quit"
+            stdscr.addstr(info_y + 4, offset_x, controls)
+            
+        draw.prev_panel = panel
     except curses.error:
         pass
     
     stdscr.refresh()
 
-def draw_game_over(stdscr, lines_cleared):
+draw.shadow = None
+draw.prev_panel = None
+draw.screen_size = None
+
+def draw_game_over(stdscr, lines_cleared, scores):
     """Draw game over screen with leaderboard"""
     max_y, max_x = stdscr.getmaxyx()
     stdscr.clear()
@@ -350,7 +556,6 @@ def draw_game_over(stdscr, lines_cleared):
         leaderboard_title = "=== LEADERBOARD ==="
         stdscr.addstr(y + 4, x_center - len(leaderboard_title)//2, leaderboard_title, curses.A_BOLD)
         
-        scores = get_leaderboard()
         for i, (name, score) in enumerate(scores):
             line = f"{i+1}. {name}: {score} lines"
             stdscr.addstr(y + 6 + i, x_center - 15, line)
@@ -365,10 +570,19 @@ def draw_game_over(stdscr, lines_cleared):
         pass
 
 def main(stdscr):
-    global pending_garbage, last_read_time, last_clear_was_line
+    global pending_garbage, last_clear_was_line, COLOR_ATTR, GHOST_ATTR
     
     curses.curs_set(0)
-    stdscr.nodelay(True)
+    stdscr.leaveok(True)  # The cursor is hidden, so curses need not move it back after each addstr
+    
+    # Initialize colors once, before anything is drawn
+    curses.start_color()
+    foregrounds = (curses.COLOR_CYAN, curses.COLOR_YELLOW, curses.COLOR_MAGENTA, curses.COLOR_GREEN,
+                   curses.COLOR_RED, curses.COLOR_BLUE, curses.COLOR_YELLOW, curses.COLOR_WHITE)
+    for i, fg in enumerate(foregrounds, start=1):
+        curses.init_pair(i, fg, curses.COLOR_BLACK)
+    COLOR_ATTR = tuple(curses.color_pair(i) for i in range(9))
+    GHOST_ATTR = tuple(attr | curses.A_DIM for attr in COLOR_ATTR)
     
     # 3-second countdown
     for i in range(3, 0, -1):
@@ -377,99 +591,128 @@ def main(stdscr):
     draw_countdown(stdscr, 0)
     time.sleep(0.5)
     
-    board = new_board()
+    board, board_cols, col_top = new_board()
     lines_cleared = 0
     
     # Generate piece bag with names tracked
-    piece_names = list(TETROMINOES.keys())
-    random.shuffle(piece_names)
-    piece_bag = piece_names[:]
+    piece_bag = deque()
+    def next_piece():
+        """Take the next piece, refilling early so the one after it is always known for the preview"""
+        if len(piece_bag) < 2:
+            piece_names = list(PIECE_NAMES)
+            random.shuffle(piece_names)
+            piece_bag.extend(piece_names)
+        return piece_bag.popleft()
     
-    current_piece_name = piece_bag.pop(0)
-    shape = [row[:] for row in TETROMINOES[current_piece_name]]
-    next_piece_name = piece_bag[0] if piece_bag else random.choice(piece_names)
-    next_shape = TETROMINOES[next_piece_name]
+    current_piece_name = next_piece()
+    shape = PIECE_MASKS[current_piece_name]
+    next_piece_name = piece_bag[0]
+    next_shape = PIECE_MASKS[next_piece_name]
     
     held_piece_name = None
     held_shape = None
     can_hold = True
     last_rotation_was_tspin = False
     
+    rot_idx = 0
     current_color = COLORS[current_piece_name]
     
-    x = WIDTH//2 - len(shape[0])//2
+    x = WIDTH//2 - len(shape)//2
     y = -1
     
-    last_tick = time.time()
+    last_tick = time.monotonic_ns()
     soft_drop_active = False
+    watch_fd = open_dir_watch(SHARED_DIR)
+    next_read = last_tick
+    key = -1
     last_rotation_time = 0
+    dirty = True  # Something on screen changed since the last draw
     
     while True:
-        current_time = time.time()
+        # Block until a key comes in or the next tick or garbage check is due
+        now = time.monotonic_ns()
+        deadline = min(last_tick + TICK_NS, next_read)
+        if pending_garbage > 0:
+            deadline = min(deadline, now + FRAME_NS)
+        wait_ms = max(1, -(now - deadline) // 1_000_000)
+        if watch_fd is None:
+            stdscr.timeout(wait_ms)
+        else:
+            # Wait in select so a file inotify reports wakes us early; right after a key
+            # curses may hold more buffered input, so only poll
+            if key == -1:
+                select.select([sys.stdin, watch_fd], [], [], wait_ms / 1000)
+            stdscr.timeout(0)
         
         # Handle input
         key = stdscr.getch()
+        current_time = time.monotonic_ns()
         soft_drop_active = False
         
         if key == ord('q'):
             signal_dead()
-            save_score(PLAYER, lines_cleared)
-            draw_game_over(stdscr, lines_cleared)
+            scores = save_score(PLAYER, lines_cleared)
+            draw_game_over(stdscr, lines_cleared, scores)
             break
-        if key == ord('a') and not collide(board, shape, x-1, y):
+        if key == ord('a') and not collide(board_cols, shape, x-1, y):
             x -= 1
-        if key == ord('d') and not collide(board, shape, x+1, y):
+            dirty = True
+        if key == ord('d') and not collide(board_cols, shape, x+1, y):
             x += 1
+            dirty = True
         if key == ord('w'):
-            r = rotate(shape)
-            if not collide(board, r, x, y):
+            rotations = ROTATIONS[current_piece_name]
+            new_rot = (rot_idx + 1) % len(rotations)
+            r = rotations[new_rot]
+            if not collide(board_cols, r, x, y):
                 shape = r
+                rot_idx = new_rot
                 last_rotation_time = current_time
+                dirty = True
         if key == ord('s'):
             soft_drop_active = True
         if key == ord(' '):
-            while not collide(board, shape, x, y+1):
+            while not collide(board_cols, shape, x, y+1):
                 y += 1
+                dirty = True
         if key == ord('c') and can_hold:
             if held_piece_name is None:
                 held_piece_name = current_piece_name
-                held_shape = TETROMINOES[held_piece_name]
-                
-                if not piece_bag:
-                    piece_names_new = list(TETROMINOES.keys())
-                    random.shuffle(piece_names_new)
-                    piece_bag = piece_names_new[:]
+                held_shape = PIECE_MASKS[held_piece_name]
                 
-                current_piece_name = piece_bag.pop(0)
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
-                next_piece_name = piece_bag[0] if piece_bag else random.choice(list(TETROMINOES.keys()))
-                next_shape = TETROMINOES[next_piece_name]
+                current_piece_name = next_piece()
+                shape = PIECE_MASKS[current_piece_name]
+                next_piece_name = piece_bag[0]
+                next_shape = PIECE_MASKS[next_piece_name]
             else:
                 current_piece_name, held_piece_name = held_piece_name, current_piece_name
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
-                held_shape = TETROMINOES[held_piece_name]
+                shape = PIECE_MASKS[current_piece_name]
+                held_shape = PIECE_MASKS[held_piece_name]
             
+            rot_idx = 0
             current_color = COLORS[current_piece_name]
-            x = WIDTH//2 - len(shape[0])//2
+            x = WIDTH//2 - len(shape)//2
             y = -1
             can_hold = False
             last_rotation_was_tspin = False
+            dirty = True
         
         # Game tick
-        tick_speed = TICK / 10 if soft_drop_active else TICK
+        tick_speed = TICK_NS // 10 if soft_drop_active else TICK_NS
         
         if current_time - last_tick >= tick_speed:
             last_tick = current_time
+            dirty = True
             
-            if not collide(board, shape, x, y+1):
+            if not collide(board_cols, shape, x, y+1):
                 y += 1
             else:
                 # Check if last rotation was recent (T-spin detection)
-                is_tspin = (current_time - last_rotation_time < 0.5) and check_tspin(board, shape, x, y, current_piece_name)
+                is_tspin = (current_time - last_rotation_time < TSPIN_WINDOW_NS) and check_tspin(board_cols, shape, x, y, current_piece_name)
                 last_rotation_was_tspin = is_tspin
                 
-                lock(board, shape, x, y, current_color)
-                board, cleared = clear_lines(board)
+                lock(board, board_cols, col_top, shape, x, y, current_color)
+                board, board_cols, cleared = clear_lines(board, board_cols, col_top)
                 lines_cleared += cleared
                 
                 # Calculate and send garbage
@@ -481,41 +724,46 @@ def main(stdscr):
                 last_clear_was_line = (cleared > 0)
                 
                 # Get next piece
-                if not piece_bag:
-                    piece_names_new = list(TETROMINOES.keys())
-                    random.shuffle(piece_names_new)
-                    piece_bag = piece_names_new[:]
-                
-                current_piece_name = piece_bag.pop(0)
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
-                next_piece_name = piece_bag[0] if piece_bag else random.choice(list(TETROMINOES.keys()))
-                next_shape = TETROMINOES[next_piece_name]
+                current_piece_name = next_piece()
+                shape = PIECE_MASKS[current_piece_name]
+                next_piece_name = piece_bag[0]
+                next_shape = PIECE_MASKS[next_piece_name]
+                rot_idx = 0
                 current_color = COLORS[current_piece_name]
-                x = WIDTH//2 - len(shape[0])//2
+                x = WIDTH//2 - len(shape)//2
                 y = -1
                 can_hold = True
                 
-                if collide(board, shape, x, y+1):
+                if collide(board_cols, shape, x, y+1):
                     signal_dead()
-                    save_score(PLAYER, lines_cleared)
-                    draw_game_over(stdscr, lines_cleared)
+                    scores = save_score(PLAYER, lines_cleared)
+                    draw_game_over(stdscr, lines_cleared, scores)
                     break
         
-        # Check for incoming garbage
-        if current_time - last_read_time >= READ_INTERVAL:
-            last_read_time = current_time
+        # Check for incoming garbage: the files inotify reported right away, and every READ_INTERVAL_NS
+        # the scan, since inotify misses files created from other hosts on network mounts
+        if watch_fd is not None:
+            for fname in read_new_files(watch_fd):
+                garbage_count = take_garbage_file(fname, f"{SHARED_DIR}/{fname}")
+                if garbage_count > 0:
+                    pending_garbage += garbage_count
+                    dirty = True
+        if current_time >= next_read:
+            next_read = current_time + READ_INTERVAL_NS
             garbage_count = check_garbage()
             if garbage_count > 0:
                 pending_garbage += garbage_count
+                dirty = True
         
         # Apply pending garbage
         if pending_garbage > 0:
-            add_garbage(board, 1)
+            add_garbage(board, board_cols, col_top, 1)
             pending_garbage -= 1
+            dirty = True
         
-        # Render
-        draw(stdscr, board, shape, x, y, pending_garbage, next_shape, held_shape, can_hold, current_color, last_rotation_was_tspin, lines_cleared, current_piece_name, next_piece_name, held_piece_name)
-        
-        time.sleep(0.01)
+        # Render, only when something changed
+        if dirty:
+            dirty = False
+            draw(stdscr, board, board_cols, col_top, shape, x, y, pending_garbage, next_shape, held_shape, can_hold, current_color, last_rotation_was_tspin, lines_cleared, current_piece_name, next_piece_name, held_piece_name)
 
 curses.wrapper(main)
\ No newline at end of file
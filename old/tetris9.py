@@ -3,69 +3,128 @@ import time
 import sys
 import os
 import random
+import select
+import ctypes
+import ctypes.util
+import struct
 from collections import deque
-import uuid
+from itertools import groupby
 
 # ---------------- CONFIG ----------------
 WIDTH = 10
 HEIGHT = 20
-TICK = 1
+TICK_NS = 1_000_000_000  # 1s, timings are integer monotonic_ns
 SHARED_DIR = "/sgoinfre/lusteur/tetris"
-READ_INTERVAL = 0.05
+READ_INTERVAL_NS = 50_000_000
 BLOCK_SIZE = 2  # Each block is [] which is 2 characters
-LEADERBOARD_REFRESH = 2.0  # Refresh leaderboard every 2 seconds
+LEADERBOARD_REFRESH_NS = 2_000_000_000  # Refresh leaderboard every 2 seconds
+TSPIN_WINDOW_NS = 500_000_000  # Rotation this recent makes a lock count as a T-spin
 # ---------------------------------------
 
+FULL_MASK = (1 << WIDTH) - 1  # Row bitmask of a complete line
+
+# Screen layout
+FIELD_WIDTH = WIDTH * BLOCK_SIZE + 2  # +2 for borders
+FIELD_HEIGHT = HEIGHT + 2  # +2 for top and bottom borders
+PREVIEW_WIDTH = 20
+PREVIEW_BOX_WIDTH = 4 * BLOCK_SIZE + 2  # Inside of a preview box
+LEADERBOARD_WIDTH = 25
+TOTAL_WIDTH = FIELD_WIDTH + PREVIEW_WIDTH + LEADERBOARD_WIDTH + 4
+
 if len(sys.argv) < 2:
     print("Usage: python3 tetris.py <player_name>")
     sys.exit(1)
 
 PLAYER = sys.argv[1]
+OWN_GARBAGE_PREFIX = f"garbage_{PLAYER}_"  # Garbage we sent, which check_garbage leaves alone
 os.makedirs(SHARED_DIR, exist_ok=True)
 
 last_read_time = 0
 pending_garbage = 0
 last_clear_was_line = False  # Track if previous drop cleared a line
+leaderboard_cache = []  # Top 10 from the last scan of SHARED_DIR
+leaderboard_mtime = None  # SHARED_DIR mtime at the last leaderboard scan
+leaderboard_mtime_since = 0  # When that mtime was first seen, by our own clock
+garbage_mtime = None  # Same, for the last garbage scan
+garbage_mtime_since = 0  # When that mtime was first seen, by our own clock
+score_files = {}  # Score filename -> parsed (name, lines), or None if it didn't parse
+board_revision = 0  # Bumped whenever the locked cells change, so a remembered ghost position expires
 
+# Shapes are tuples, never changed in place, so pieces can share them without copying
 TETROMINOES = {
-    "I": [[1,1,1,1]],
-    "O": [[1,1],[1,1]],
-    "T": [[0,1,0],[1,1,1]],
-    "S": [[0,1,1],[1,1,0]],
-    "Z": [[1,1,0],[0,1,1]],
-    "J": [[1,0,0],[1,1,1]],
-    "L": [[0,0,1],[1,1,1]]
+    "I": ((1,1,1,1),),
+    "O": ((1,1),(1,1)),
+    "T": ((0,1,0),(1,1,1)),
+    "S": ((0,1,1),(1,1,0)),
+    "Z": ((1,1,0),(0,1,1)),
+    "J": ((1,0,0),(1,1,1)),
+    "L": ((0,0,1),(1,1,1))
 }
 
 COLORS = {
     "I": 1, "O": 2, "T": 3, "S": 4, "Z": 5, "J": 6, "L": 7, "garbage": 8
 }
 
+# Garbage rows indexed by hole column, as row masks and as color bytes
+GARBAGE_BITS = tuple(FULL_MASK ^ (1 << hole) for hole in range(WIDTH))
+GARBAGE_ROWS = tuple(bytes(0 if c == hole else COLORS["garbage"] for c in range(WIDTH)) for hole in range(WIDTH))
+
 # Global for colors initialization
 COLORS_INITIALIZED = False
 
+# curses attribute per color pair, and the dimmed ghost; filled in by main once the color pairs exist
+COLOR_ATTR = ()
+GHOST_ATTR = 0
+
 def rotate(shape):
-    return [list(row) for row in zip(*shape[::-1])]
+    return tuple(zip(*shape[::-1]))
+
+def cells_of(shape):
+    """(row, col) of every filled cell of a shape, so loops skip its empty ones"""
+    return tuple((r, c) for r, row in enumerate(shape) for c, v in enumerate(row) if v)
+
+def masks_of(shape):
+    """Bitmask of each row of a shape, bit c set for a filled column c"""
+    return tuple(sum(1 << c for c, v in enumerate(row) if v) for row in shape)
+
+def unique_rotations(shape):
+    """Return the distinct clockwise rotations of a shape, starting with the shape itself"""
+    rotations = [shape]
+    while True:
+        r = rotate(rotations[-1])
+        if r == shape:
+            return tuple(rotations)
+        rotations.append(r)
+
+# Every distinct rotation is built once here; rotating in game just steps an index
+ROTATIONS = {name: unique_rotations(shape) for name, shape in TETROMINOES.items()}
+
+# Filled cells and row masks of every rotation
+CELLS = {shape: cells_of(shape) for rotations in ROTATIONS.values() for shape in rotations}
+MASKS = {shape: masks_of(shape) for rotations in ROTATIONS.values() for shape in rotations}
 
 def new_board():
-    return [[0]*WIDTH for _ in range(HEIGHT)]
-
-def collide(board, shape, x, y):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c]:
-                nx, ny = x+c, y+r
-                if nx < 0 or nx >= WIDTH or ny >= HEIGHT:
-                    return True
-                if ny >= 0 and board[ny][nx]:
-                    return True
+    """Return the cell colors (for drawing) and one bitmask per row (for collisions)"""
+    return [bytearray(WIDTH) for _ in range(HEIGHT)], [0] * HEIGHT
+
+def collide(board_bits, masks, x, y):
+    if x < 0:
+        return True  # Shapes start at column 0, so any negative x is through the left wall
+    for r, mask in enumerate(masks):
+        row_bits = mask << x
+        if y + r >= HEIGHT or row_bits > FULL_MASK:
+            return True
+        if y + r >= 0 and board_bits[y + r] & row_bits:
+            return True
     return False
 
-def lock(board, shape, x, y, color):
-    for r in range(len(shape)):
-        for c in range(len(shape[0])):
-            if shape[r][c] and y+r >= 0:
-                board[y+r][x+c] = color
+def lock(board, board_bits, cells, x, y, color):
+    global board_revision
+    board_revision += 1
+    for r, c in cells:
+        if y+r >= 0:
+            board[y+r][x+c] = color
+            board_bits[y+r] |= 1 << (x+c)
 
 def check_tspin(board, shape, x, y, piece_name):
     """Check if the last rotation was a T-spin"""
@@ -87,12 +146,18 @@ def check_tspin(board, shape, x, y, piece_name):
     
     return corners_filled >= 3
 
-def clear_lines(board):
-    new = [row for row in board if not all(row)]
-    cleared = HEIGHT - len(new)
-    while len(new) < HEIGHT:
-        new.insert(0, [0]*WIDTH)
-    return new, cleared
+def clear_lines(board, board_bits, y, rows):
+    """Clear full rows; only the rows y to y+rows-1 the piece just locked into can have filled up"""
+    if FULL_MASK not in board_bits[max(y, 0):y + rows]:
+        return board, board_bits, 0
+    global board_revision
+    keep = [r for r, bits in enumerate(board_bits) if bits != FULL_MASK]
+    cleared = HEIGHT - len(keep)
+    if cleared:
+        board_revision += 1
+        board = [bytearray(WIDTH) for _ in range(cleared)] + [board[r] for r in keep]
+        board_bits = [0] * cleared + [board_bits[r] for r in keep]
+    return board, board_bits, cleared
 
 def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     """Calculate garbage lines to send based on Tetris rules"""
@@ -120,13 +185,19 @@ def calculate_garbage(lines_cleared, is_tspin, last_was_line):
     
     return 0
 
-def add_garbage(board, n):
-    """Add garbage lines with one random hole"""
-    for _ in range(n):
-        board.pop(0)
-        hole_pos = random.randint(0, WIDTH - 1)
-        garbage_line = [8 if i != hole_pos else 0 for i in range(WIDTH)]
-        board.append(garbage_line)
+def add_garbage(board, board_bits, n):
+    """Add garbage lines with one random hole, shifting the board up once for all of them"""
+    global board_revision
+    board_revision += 1
+    holes = [random.randint(0, WIDTH - 1) for _ in range(n)]
+    del board[:n]
+    del board_bits[:n]
+    board.extend(bytearray(GARBAGE_ROWS[hole_pos]) for hole_pos in holes)
+    board_bits.extend(GARBAGE_BITS[hole_pos] for hole_pos in holes)
+
+def create_signal_file(path):
+    """Create an empty file with a bare open/close syscall pair, no Python file object"""
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
 
 def send_garbage(amount):
     """Send garbage to all opponents by creating files with line count in name"""
@@ -135,20 +206,33 @@ def send_garbage(amount):
     
     try:
         # Create a unique file with the amount and sender in the name
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = f"{random.getrandbits(32):08x}"
         filename = f"garbage_{PLAYER}_{amount}_lines_{unique_id}.txt"
         filepath = f"{SHARED_DIR}/{filename}"
-        open(filepath, "w").close()
+        create_signal_file(filepath)
     except:
         pass
 
 def check_garbage():
     """Check for garbage files, sum them up, and remove them"""
+    global garbage_mtime, garbage_mtime_since
     garbage_count = 0
+    to_remove = []
     try:
-        files = os.listdir(SHARED_DIR)
-        for fname in files:
-            if fname.startswith("garbage_") and fname.endswith(".txt"):
+        # Creating or removing a file bumps the directory mtime, so an unchanged one means no new garbage.
+        # Timestamps can be coarse, so it must stay unchanged for a second by our own clock (the server's may differ).
+        dir_mtime = os.stat(SHARED_DIR).st_mtime_ns
+        now = time.time_ns()
+        if dir_mtime != garbage_mtime:
+            garbage_mtime, garbage_mtime_since = dir_mtime, now
+        elif now - garbage_mtime_since > 1_000_000_000:
+            return 0
+        
+        with os.scandir(SHARED_DIR) as entries:
+            for entry in entries:
+                fname = entry.name
+                if not (fname.startswith("garbage_") and fname.endswith(".txt")):
+                    continue
                 # Extract the sender and number of lines from the filename
                 # Format: garbage_{PLAYER}_{amount}_lines_{unique_id}.txt
                 try:
@@ -161,25 +245,27 @@ def check_garbage():
                     
                     lines = int(parts[2])
                     garbage_count += lines
-                    
-                    # Remove the file
-                    os.remove(f"{SHARED_DIR}/{fname}")
                 except:
-                    # If we can't parse it, try to remove it anyway
-                    try:
-                        os.remove(f"{SHARED_DIR}/{fname}")
-                    except:
-                        pass
+                    # If we can't parse it, remove it anyway
+                    pass
+                to_remove.append(entry.path)
     except:
         pass
+    
+    # Remove the files once the listing is done
+    for path in to_remove:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
     return garbage_count
 
 def signal_dead(lines_cleared):
     """Signal that player is dead by creating score file"""
     try:
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = f"{random.getrandbits(32):08x}"
         score_file = f"{SHARED_DIR}/score_{PLAYER}_{lines_cleared}_lines_{unique_id}.txt"
-        open(score_file, "w").close()
+        create_signal_file(score_file)
     except:
         pass
 
@@ -187,66 +273,172 @@ def signal_dead(lines_cleared):
 
 def get_leaderboard():
     """Get leaderboard from score files in shared directory"""
-    scores = []
+    global leaderboard_cache, leaderboard_mtime, leaderboard_mtime_since, score_files
     try:
-        files = os.listdir(SHARED_DIR)
-        for fname in files:
-            if fname.startswith("score_") and fname.endswith(".txt"):
+        # Creating or removing a file bumps the directory mtime, so an unchanged one means the same scores.
+        # Timestamps can be coarse, so it must stay unchanged for a second by our own clock (the server's may differ).
+        dir_mtime = os.stat(SHARED_DIR).st_mtime_ns
+        now = time.time_ns()
+        if dir_mtime != leaderboard_mtime:
+            leaderboard_mtime, leaderboard_mtime_since = dir_mtime, now
+        elif now - leaderboard_mtime_since > 1_000_000_000:
+            return leaderboard_cache
+        
+        # Only names not seen in the last scan get parsed; files that are gone drop out
+        parsed = {}
+        with os.scandir(SHARED_DIR) as entries:
+            for entry in entries:
+                fname = entry.name
+                if not (fname.startswith("score_") and fname.endswith(".txt")):
+                    continue
+                if fname in score_files:
+                    parsed[fname] = score_files[fname]
+                    continue
+                parsed[fname] = None
                 try:
                     # Format: score_{PLAYER}_{lines}_lines_{unique_id}.txt
                     parts = fname.split("_")
                     if len(parts) >= 4:
-                        player_name = parts[1]
-                        lines_cleared = int(parts[2])
-                        scores.append({
-                            "name": player_name,
-                            "lines": lines_cleared
-                        })
+                        parsed[fname] = (parts[1], int(parts[2]))
                 except:
                     pass
+        score_files = parsed
     except:
         pass
     
+    scores = [{"name": name, "lines": lines} for name, lines in filter(None, score_files.values())]
+    
     # Sort by lines descending
     scores.sort(key=lambda x: x["lines"], reverse=True)
     
-    # Return top 10
-    return scores[:10]
+    # Keep the top 10 for the next unchanged check
+    leaderboard_cache = scores[:10]
+    return leaderboard_cache
+
+# ============= DIRECTORY WATCH =============
+
+# New shared files are reported by inotify, opened through libc since os has no wrapper
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _libc.inotify_init1
+    _libc.inotify_add_watch
+except (OSError, AttributeError):
+    _libc = None  # Not Linux, main() falls back to polling the directory
+
+IN_CREATE = 0x100
+IN_MOVED_TO = 0x80
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len, then len bytes of NUL-padded name
+
+def open_dir_watch(path):
+    """Return a non-blocking inotify fd reporting files created or moved into path, or None if unavailable"""
+    if _libc is None:
+        return None
+    fd = _libc.inotify_init1(os.O_NONBLOCK)
+    if fd < 0:
+        return None
+    if _libc.inotify_add_watch(fd, path.encode(), IN_CREATE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+def read_new_files(fd):
+    """Return the names of the files reported since the last call"""
+    names = []
+    try:
+        while True:
+            buf = os.read(fd, 4096)
+            if not buf:
+                break
+            pos = 0
+            while pos < len(buf):
+                name_len = INOTIFY_EVENT.unpack_from(buf, pos)[3]
+                pos += INOTIFY_EVENT.size
+                names.append(buf[pos:pos + name_len].rstrip(b"\0").decode(errors="replace"))
+                pos += name_len
+    except BlockingIOError:
+        pass
+    return names
 
 # ============= GHOST PIECE FUNCTIONS =============
 
-def get_ghost_y(board, shape, x, y):
+def get_ghost_y(board_bits, masks, x, y):
     """Calculate the Y position where the piece would land"""
+    # Frames where neither the piece nor the board moved reuse the last answer
+    key = (board_revision, masks, x, y)
+    if key == get_ghost_y.key:
+        return get_ghost_y.ghost_y
     ghost_y = y
-    while not collide(board, shape, x, ghost_y + 1):
+    while not collide(board_bits, masks, x, ghost_y + 1):
         ghost_y += 1
+    get_ghost_y.key, get_ghost_y.ghost_y = key, ghost_y
     return ghost_y
 
-def draw_preview(stdscr, shape, piece_name, row_offset, col_offset, title):
-    """Draw a preview box with a tetromino"""
+get_ghost_y.key = None
+get_ghost_y.ghost_y = None
+
+def put(stdscr, y, x, text, attr=0):
+    """addstr, skipped when the same text and attributes are already at (y, x)"""
+    row = put.rows.setdefault(y, {})
+    if row.get(x) == (text, attr):
+        return
+    stdscr.addstr(y, x, text, attr)
+    # Anything this write overlapped is no longer on screen as remembered
+    end = x + len(text)
+    for old_x in [old_x for old_x, (old_text, _) in row.items() if old_x < end and old_x + len(old_text) > x]:
+        del row[old_x]
+    row[x] = (text, attr)
+
+put.rows = {}
+
+def draw_preview(stdscr, shape, piece_name, row_offset, col_offset):
+    """Draw a tetromino inside its preview box; the frame is part of the scaffold"""
     try:
-        # Draw title
-        stdscr.addstr(row_offset, col_offset, title)
-        
-        # Draw box
-        box_width = 4 * BLOCK_SIZE + 2
-        stdscr.addstr(row_offset + 1, col_offset, "+" + "-" * box_width + "+")
-        for i in range(4):
-            stdscr.addstr(row_offset + 2 + i, col_offset, "|" + " " * box_width + "|")
-        stdscr.addstr(row_offset + 6, col_offset, "+" + "-" * box_width + "+")
-        
-        # Draw the piece centered in the preview
+        # Compose the inside of the box with the piece centered in it
+        inside = [[" "] * PREVIEW_BOX_WIDTH for _ in range(4)]
+        attr = 0
         if shape and piece_name:
-            color = COLORS.get(piece_name, 7)
-            y_offset = 2 + (4 - len(shape)) // 2
-            x_offset = col_offset + 1 + (box_width - len(shape[0]) * BLOCK_SIZE) // 2
-            for r in range(len(shape)):
-                for c in range(len(shape[0])):
-                    if shape[r][c]:
-                        stdscr.addstr(row_offset + y_offset + r, x_offset + c * BLOCK_SIZE, "[]", curses.color_pair(color))
+            attr = COLOR_ATTR[COLORS.get(piece_name, 7)]
+            y_offset = (4 - len(shape)) // 2
+            x_offset = (PREVIEW_BOX_WIDTH - len(shape[0]) * BLOCK_SIZE) // 2
+            for r, c in CELLS[shape]:
+                inside[y_offset + r][x_offset + c * BLOCK_SIZE:x_offset + (c + 1) * BLOCK_SIZE] = "[]"
+        
+        # One write per run of blanks or blocks, so an unchanged box is skipped
+        for i, line in enumerate(inside):
+            row_y = row_offset + 2 + i
+            col = col_offset + 1
+            for is_block, run in groupby(line, key=lambda ch: ch != " "):
+                text = "".join(run)
+                put(stdscr, row_y, col, text, attr if is_block else 0)
+                col += len(text)
     except curses.error:
         pass
 
+def draw_scaffold(stdscr, offset_x, offset_y):
+    """Draw what never changes during a game: borders, preview frames and the leaderboard header"""
+    # Field borders and side walls
+    top_border = "#" * FIELD_WIDTH
+    stdscr.addstr(offset_y, offset_x, top_border)
+    for r in range(HEIGHT):
+        stdscr.addstr(offset_y + r + 1, offset_x, "#")
+        stdscr.addstr(offset_y + r + 1, offset_x + FIELD_WIDTH - 1, "#")
+    stdscr.addstr(offset_y + HEIGHT + 1, offset_x, top_border)
+    
+    # Preview box frames with their titles
+    preview_col = offset_x + FIELD_WIDTH + 2
+    for row_offset, title in ((offset_y, "HOLD (C)"), (offset_y + 8, "NEXT")):
+        stdscr.addstr(row_offset, preview_col, title)
+        stdscr.addstr(row_offset + 1, preview_col, "+" + "-" * PREVIEW_BOX_WIDTH + "+")
+        for i in range(4):
+            stdscr.addstr(row_offset + 2 + i, preview_col, "|")
+            stdscr.addstr(row_offset + 2 + i, preview_col + PREVIEW_BOX_WIDTH + 1, "|")
+        stdscr.addstr(row_offset + 6, preview_col, "+" + "-" * PREVIEW_BOX_WIDTH + "+")
+    
+    # Leaderboard header
+    leaderboard_col = preview_col + PREVIEW_WIDTH + 2
+    stdscr.addstr(offset_y, leaderboard_col, "=== TOP 10 ===")
+    stdscr.addstr(offset_y + 1, leaderboard_col, f"{'#':<3}{'Name':<10}{'Lines'}")
+
 def draw_countdown(stdscr, count):
     """Draw countdown in center of screen"""
     max_y, max_x = stdscr.getmaxyx()
@@ -262,120 +454,112 @@ def draw_countdown(stdscr, count):
     except curses.error:
         pass
 
-def draw(stdscr, board, shape, piece_name, x, y, garbage_pending, next_shape, next_piece_name, 
+def draw(stdscr, board, board_bits, cells, masks, piece_name, x, y, next_shape, next_piece_name, 
          held_shape, held_piece_name, can_hold, color, last_rotation_was_tspin, total_lines, leaderboard):
     """Draw the game state centered on screen"""
-    max_y, max_x = stdscr.getmaxyx()
-    
-    # Calculate game field dimensions
-    field_width = WIDTH * BLOCK_SIZE + 2  # +2 for borders
-    field_height = HEIGHT + 2  # +2 for top and bottom borders
-    preview_width = 20
-    leaderboard_width = 25
-    total_width = field_width + preview_width + leaderboard_width + 4
+    screen_size = stdscr.getmaxyx()
     
-    # Calculate offset to center the game
-    offset_x = max((max_x - total_width) // 2, 0)
-    offset_y = max((max_y - field_height - 5) // 2, 0)
+    # Nothing to do when no key moved the piece, no tick ran and no score came in
+    state = (screen_size, board_revision, piece_name, masks, x, y, next_piece_name,
+             held_piece_name, can_hold, last_rotation_was_tspin, total_lines, leaderboard)
+    if state == draw.prev_state:
+        return
+    draw.prev_state = state
     
     # Calculate ghost position
-    ghost_y = get_ghost_y(board, shape, x, y)
+    ghost_y = get_ghost_y(board_bits, masks, x, y)
+    
+    # Board cells covered by the current piece and its ghost
+    piece_cells = {(y + pr, x + pc) for pr, pc in cells}
+    ghost_cells = {(ghost_y + pr, x + pc) for pr, pc in cells} if ghost_y != y else set()
     
     try:
-        # Don't clear screen, use erase to reduce flicker
-        stdscr.erase()
+        # Only cells that changed since the last frame are written; a resize
+        # recenters the game and repaints all, starting with the scaffold
+        if screen_size != draw.screen_size:
+            max_y, max_x = screen_size
+            draw.offsets = (max((max_x - TOTAL_WIDTH) // 2, 0), max((max_y - FIELD_HEIGHT - 5) // 2, 0))
+            draw.screen_size = screen_size
+            stdscr.clear()
+            put.rows.clear()
+            draw.prev_leaderboard = None
+            draw_scaffold(stdscr, *draw.offsets)
+        offset_x, offset_y = draw.offsets
         
-        # Draw top border
-        top_border = "#" * field_width
-        stdscr.addstr(offset_y, offset_x, top_border)
-        
-        # Draw board with side walls
+        # Draw board, one write per run of same-looking cells
+        piece_attr = COLOR_ATTR[color]
         for r in range(HEIGHT):
-            stdscr.addstr(offset_y + r + 1, offset_x, "#")
+            row_y = offset_y + r + 1
+            
+            # Current piece first, then ghost, then the board itself; None is an empty cell
+            row_attrs = []
             for c in range(WIDTH):
-                cell_drawn = False
-                
-                # Check if current piece is here
-                for pr in range(len(shape)):
-                    for pc in range(len(shape[0])):
-                        if shape[pr][pc]:
-                            if r == y + pr and c == x + pc:
-                                stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(color))
-                                cell_drawn = True
-                                break
-                    if cell_drawn:
-                        break
-                
-                # Check if ghost piece is here (only if not current piece)
-                if not cell_drawn and ghost_y != y:
-                    for pr in range(len(shape)):
-                        for pc in range(len(shape[0])):
-                            if shape[pr][pc]:
-                                if r == ghost_y + pr and c == x + pc:
-                                    stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(9) | curses.A_DIM)
-                                    cell_drawn = True
-                                    break
-                        if cell_drawn:
-                            break
-                
-                # Draw board cell
-                if not cell_drawn:
-                    if board[r][c]:
-                        cell_color = board[r][c]
-                        stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "[]", curses.color_pair(cell_color))
-                    else:
-                        stdscr.addstr(offset_y + r + 1, offset_x + c * BLOCK_SIZE + 1, "  ")
-                
-            stdscr.addstr(offset_y + r + 1, offset_x + field_width - 1, "#")
-        
-        # Draw bottom border
-        stdscr.addstr(offset_y + HEIGHT + 1, offset_x, top_border)
-        
-        # Draw preview boxes
-        preview_col = offset_x + field_width + 2
-        draw_preview(stdscr, held_shape, held_piece_name, offset_y, preview_col, "HOLD (C)")
-        draw_preview(stdscr, next_shape, next_piece_name, offset_y + 8, preview_col, "NEXT")
+                if (r, c) in piece_cells:
+                    row_attrs.append(piece_attr)
+                elif (r, c) in ghost_cells:
+                    row_attrs.append(GHOST_ATTR)
+                elif board[r][c]:
+                    row_attrs.append(COLOR_ATTR[board[r][c]])
+                else:
+                    row_attrs.append(None)
+            
+            col = offset_x + 1
+            for attr, run in groupby(row_attrs):
+                run_len = sum(1 for _ in run)
+                if attr is None:
+                    put(stdscr, row_y, col, "  " * run_len)
+                else:
+                    put(stdscr, row_y, col, "[]" * run_len, attr)
+                col += run_len * BLOCK_SIZE
         
-        # Draw leaderboard on the right
-        leaderboard_col = preview_col + preview_width + 2
-        stdscr.addstr(offset_y, leaderboard_col, "=== TOP 10 ===")
-        stdscr.addstr(offset_y + 1, leaderboard_col, f"{'#':<3}{'Name':<10}{'Lines'}")
+        # Draw the pieces in the preview boxes
+        preview_col = offset_x + FIELD_WIDTH + 2
+        draw_preview(stdscr, held_shape, held_piece_name, offset_y, preview_col)
+        draw_preview(stdscr, next_shape, next_piece_name, offset_y + 8, preview_col)
         
-        for i, entry in enumerate(leaderboard[:10]):
-            row_y = offset_y + 2 + i
-            rank_text = f"{i+1:<3}{entry['name'][:9]:<10}{entry['lines']}"
-            # Highlight current player
-            if entry['name'] == PLAYER:
-                stdscr.addstr(row_y, leaderboard_col, rank_text, curses.A_BOLD | curses.color_pair(4))
-            else:
-                stdscr.addstr(row_y, leaderboard_col, rank_text)
+        # Draw leaderboard on the right, only when the scores changed
+        if leaderboard != draw.prev_leaderboard:
+            leaderboard_col = preview_col + PREVIEW_WIDTH + 2
+            for i in range(10):
+                row_y = offset_y + 2 + i
+                if i >= len(leaderboard):
+                    put(stdscr, row_y, leaderboard_col, " " * LEADERBOARD_WIDTH)
+                    continue
+                entry = leaderboard[i]
+                rank_text = f"{i+1:<3}{entry['name'][:9]:<10}{entry['lines']:<12}"
+                # Highlight current player
+                if entry['name'] == PLAYER:
+                    put(stdscr, row_y, leaderboard_col, rank_text, curses.A_BOLD | COLOR_ATTR[4])
+                else:
+                    put(stdscr, row_y, leaderboard_col, rank_text)
+            draw.prev_leaderboard = leaderboard
         
         # Draw info below the game
         info_y = offset_y + HEIGHT + 3
-        stdscr.addstr(info_y, offset_x, f"Player: {PLAYER}    Lines: {total_lines}         ")
-        
-        if garbage_pending > 0:
-            stdscr.addstr(info_y + 1, offset_x, f"Garbage incoming: {garbage_pending}    ")
-        else:
-            stdscr.addstr(info_y + 1, offset_x, " " * 30)
+        put(stdscr, info_y, offset_x, f"Player: {PLAYER}    Lines: {total_lines}         ")
         
         if last_rotation_was_tspin:
-            stdscr.addstr(info_y + 2, offset_x, "T-SPIN!                    ", curses.A_BOLD | curses.color_pair(3))
+            put(stdscr, info_y + 2, offset_x, "T-SPIN!                    ", curses.A_BOLD | COLOR_ATTR[3])
         else:
-            stdscr.addstr(info_y + 2, offset_x, " " * 30)
+            put(stdscr, info_y + 2, offset_x, " " * 30)
         
         controls = "A/D=Move W=Rotate S=Soft SPACE=Hard "
         controls += "C=Hold(used) " if not can_hold else "C=Hold "
-        controls += "Q=Quit"
-        stdscr.addstr(info_y + 3, offset_x, controls)
+        controls += "Q=Quit      "  # Covers the longer line once hold is used
+        put(stdscr, info_y + 3, offset_x, controls)
         
     except curses.error:
         pass
     
     stdscr.refresh()
 
+draw.screen_size = None
+draw.prev_state = None
+draw.offsets = (0, 0)
+draw.prev_leaderboard = None
+
 def main(stdscr):
-    global pending_garbage, last_read_time, last_clear_was_line, COLORS_INITIALIZED
+    global pending_garbage, last_read_time, last_clear_was_line, leaderboard_mtime, COLORS_INITIALIZED, COLOR_ATTR, GHOST_ATTR
     
     curses.curs_set(0)
     stdscr.nodelay(True)
@@ -393,6 +577,8 @@ def main(stdscr):
         curses.init_pair(7, curses.COLOR_YELLOW, -1)
         curses.init_pair(8, curses.COLOR_WHITE, -1)
         curses.init_pair(9, curses.COLOR_WHITE, -1)
+        COLOR_ATTR = tuple(curses.color_pair(i) for i in range(10))
+        GHOST_ATTR = COLOR_ATTR[9] | curses.A_DIM
         COLORS_INITIALIZED = True
     
     # 3-second countdown
@@ -402,7 +588,7 @@ def main(stdscr):
     draw_countdown(stdscr, 0)
     time.sleep(0.5)
     
-    board = new_board()
+    board, board_bits = new_board()
     total_lines = 0
     
     # Generate piece bag with names
@@ -415,13 +601,15 @@ def main(stdscr):
     
     # Get first piece with its name
     current_piece_name = piece_bag.pop(0)
-    shape = [row[:] for row in TETROMINOES[current_piece_name]]
+    shape = TETROMINOES[current_piece_name]
+    cells, masks = CELLS[shape], MASKS[shape]
+    rot_idx = 0
     
     # Get next piece
     if not piece_bag:
         piece_bag = refill_bag()
     next_piece_name = piece_bag[0]
-    next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+    next_shape = TETROMINOES[next_piece_name]
     
     held_shape = None
     held_piece_name = None
@@ -433,61 +621,88 @@ def main(stdscr):
     x = WIDTH//2 - len(shape[0])//2
     y = -1
     
-    last_tick = time.time()
+    last_tick = time.monotonic_ns()
     soft_drop_active = False
+    watch_fd = open_dir_watch(SHARED_DIR)
     last_rotation_time = 0
     last_leaderboard_refresh = 0
     leaderboard = []
     
+    # Names used every loop pass are bound to locals once, skipping the global/attribute lookups
+    _time = time.monotonic_ns
+    _getch = stdscr.getch
+    _collide = collide
+    _draw = draw
+    quit_key, left_key, right_key, rotate_key, soft_key, hard_key, hold_key = map(ord, "qadws c")
+    key = -1
+    
     while True:
-        current_time = time.time()
+        # Block until a key comes in or the next tick, read or leaderboard refresh is due
+        now = _time()
+        deadline = min(last_tick + TICK_NS, last_read_time + READ_INTERVAL_NS,
+                       last_leaderboard_refresh + LEADERBOARD_REFRESH_NS)
+        wait_ms = max(0, -(now - deadline) // 1_000_000)
+        if watch_fd is None:
+            stdscr.timeout(wait_ms)
+        else:
+            # Wait in select so a file inotify reports wakes us early; right after a key
+            # curses may hold more buffered input, so only poll
+            if key == -1:
+                select.select([sys.stdin, watch_fd], [], [], wait_ms / 1000)
+            stdscr.timeout(0)
         
         # Handle input
-        key = stdscr.getch()
+        key = _getch()
+        current_time = _time()
         soft_drop_active = False
         
-        if key == ord('q'):
+        if key == quit_key:
             signal_dead(total_lines)
             break
-        if key == ord('a') and not collide(board, shape, x-1, y):
+        if key == left_key and not _collide(board_bits, masks, x-1, y):
             x -= 1
-        if key == ord('d') and not collide(board, shape, x+1, y):
+        if key == right_key and not _collide(board_bits, masks, x+1, y):
             x += 1
-        if key == ord('w'):
-            r = rotate(shape)
+        if key == rotate_key:
+            rotations = ROTATIONS[current_piece_name]
+            new_rot = (rot_idx + 1) % len(rotations)
+            r = rotations[new_rot]
+            r_masks = MASKS[r]
             # Try wall kicks
             kicks = [0, -1, 1, -2, 2]
             for kick in kicks:
-                if not collide(board, r, x + kick, y):
-                    shape = r
+                if not _collide(board_bits, r_masks, x + kick, y):
+                    shape, cells, masks = r, CELLS[r], r_masks
+                    rot_idx = new_rot
                     x += kick
                     last_rotation_time = current_time
                     break
-        if key == ord('s'):
+        if key == soft_key:
             soft_drop_active = True
-        if key == ord(' '):
-            while not collide(board, shape, x, y+1):
-                y += 1
-        if key == ord('c') and can_hold:
+        if key == hard_key:
+            y = get_ghost_y(board_bits, masks, x, y)
+        if key == hold_key and can_hold:
             if held_shape is None:
-                held_shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                held_shape = TETROMINOES[current_piece_name]
                 held_piece_name = current_piece_name
                 
                 # Get next piece
                 if not piece_bag:
                     piece_bag = refill_bag()
                 current_piece_name = piece_bag.pop(0)
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                shape = TETROMINOES[current_piece_name]
                 
                 if not piece_bag:
                     piece_bag = refill_bag()
                 next_piece_name = piece_bag[0]
-                next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+                next_shape = TETROMINOES[next_piece_name]
             else:
                 # Swap current and held
-                shape, held_shape = [row[:] for row in TETROMINOES[held_piece_name]], [row[:] for row in TETROMINOES[current_piece_name]]
+                shape, held_shape = TETROMINOES[held_piece_name], TETROMINOES[current_piece_name]
                 current_piece_name, held_piece_name = held_piece_name, current_piece_name
             
+            cells, masks = CELLS[shape], MASKS[shape]
+            rot_idx = 0
             current_color = COLORS[current_piece_name]
             x = WIDTH//2 - len(shape[0])//2
             y = -1
@@ -495,20 +710,20 @@ def main(stdscr):
             last_rotation_was_tspin = False
         
         # Game tick
-        tick_speed = TICK / 10 if soft_drop_active else TICK
+        tick_speed = TICK_NS // 10 if soft_drop_active else TICK_NS
         
         if current_time - last_tick >= tick_speed:
             last_tick = current_time
             
-            if not collide(board, shape, x, y+1):
+            if not _collide(board_bits, masks, x, y+1):
                 y += 1
             else:
                 # Check if last rotation was recent (T-spin detection)
-                is_tspin = (current_time - last_rotation_time < 0.5) and check_tspin(board, shape, x, y, current_piece_name)
+                is_tspin = (current_time - last_rotation_time < TSPIN_WINDOW_NS) and check_tspin(board, shape, x, y, current_piece_name)
                 last_rotation_was_tspin = is_tspin
                 
-                lock(board, shape, x, y, current_color)
-                board, cleared = clear_lines(board)
+                lock(board, board_bits, cells, x, y, current_color)
+                board, board_bits, cleared = clear_lines(board, board_bits, y, len(masks))
                 total_lines += cleared
                 
                 # Calculate and send garbage
@@ -524,44 +739,54 @@ def main(stdscr):
                     piece_bag = refill_bag()
                 
                 current_piece_name = piece_bag.pop(0)
-                shape = [row[:] for row in TETROMINOES[current_piece_name]]
+                shape = TETROMINOES[current_piece_name]
+                cells, masks = CELLS[shape], MASKS[shape]
+                rot_idx = 0
                 
                 if not piece_bag:
                     piece_bag = refill_bag()
                 next_piece_name = piece_bag[0]
-                next_shape = [row[:] for row in TETROMINOES[next_piece_name]]
+                next_shape = TETROMINOES[next_piece_name]
                 
                 current_color = COLORS[current_piece_name]
                 x = WIDTH//2 - len(shape[0])//2
                 y = -1
                 can_hold = True
                 
-                if collide(board, shape, x, y+1):
+                if _collide(board_bits, masks, x, y+1):
                     signal_dead(total_lines)
                     break
         
-        # Check for incoming garbage
-        if current_time - last_read_time >= READ_INTERVAL:
+        # Garbage is scanned for every READ_INTERVAL_NS; an inotify report only brings the scan forward
+        new_garbage = False
+        if watch_fd is not None:
+            for fname in read_new_files(watch_fd):
+                if fname.startswith("garbage_") and not fname.startswith(OWN_GARBAGE_PREFIX):
+                    new_garbage = True
+                elif fname.startswith("score_"):
+                    # Someone finished: rescan the scores right away
+                    leaderboard_mtime = None
+                    last_leaderboard_refresh = 0
+        if new_garbage or current_time - last_read_time >= READ_INTERVAL_NS:
             last_read_time = current_time
             garbage_count = check_garbage()
             if garbage_count > 0:
                 pending_garbage += garbage_count
         
-        # Apply pending garbage
+        # Apply all pending garbage at once
         if pending_garbage > 0:
-            add_garbage(board, 1)
-            pending_garbage -= 1
+            n = min(pending_garbage, HEIGHT)
+            add_garbage(board, board_bits, n)
+            pending_garbage -= n
         
         # Refresh leaderboard periodically
-        if current_time - last_leaderboard_refresh >= LEADERBOARD_REFRESH:
+        if current_time - last_leaderboard_refresh >= LEADERBOARD_REFRESH_NS:
             last_leaderboard_refresh = current_time
             leaderboard = get_leaderboard()
         
         # Render
-        draw(stdscr, board, shape, current_piece_name, x, y, pending_garbage, 
+        _draw(stdscr, board, board_bits, cells, masks, current_piece_name, x, y, 
              next_shape, next_piece_name, held_shape, held_piece_name, 
              can_hold, current_color, last_rotation_was_tspin, total_lines, leaderboard)
-        
-        time.sleep(0.01)
 
 curses.wrapper(main)
\ No newline at end of file